@@ -0,0 +1,149 @@
+import json
+import math
+import time
+import tracemalloc
+
+"""
+Tiny benchmark harness: a benchmark is a setup function, registered with the
+@benchmark decorator, that returns a callable doing `ops` operations. The
+runner times that callable (best of several repeats) and measures the memory
+allocated per operation, then compares both with a stored JSON baseline.
+
+Raw ops/s depend on the machine and on how busy it is, so every repeat also
+times a fixed pure Python calibration loop and speeds are stored relative to
+it: a baseline recorded on one machine holds on another one.
+"""
+
+BENCHMARKS = {}
+
+
+class BenchmarkResult:
+    def __init__(
+        self, name: str, ops_per_sec: float, bytes_per_op: float, relative_speed: float
+    ):
+        self.name = name
+        self.ops_per_sec = ops_per_sec
+        self.bytes_per_op = bytes_per_op
+        # ops per calibration loop run in the same time
+        self.relative_speed = relative_speed
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<32} {self.ops_per_sec:>14,.0f} ops/s"
+            f" {self.relative_speed:>12,.4f} rel"
+            f" {self.bytes_per_op:>10,.1f} B/op"
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "relative_speed": self.relative_speed,
+            "bytes_per_op": self.bytes_per_op,
+        }
+
+
+def benchmark(name: str, ops: int = 1):
+    """Registers setup() -> callable, the callable doing `ops` operations per call"""
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, ops)
+        return setup
+
+    return register
+
+
+def calibration_loop() -> int:
+    """Fixed interpreter workload: arithmetic, calls, list and dict access"""
+    counts = {}
+    values = []
+    for index in range(200):
+        values.append(index * 7 % 13)
+        counts[index % 5] = counts.get(index % 5, 0) + len(values)
+    return sum(values) + max(counts.values())
+
+
+def time_calls(operation, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        operation()
+    return time.perf_counter() - started
+
+
+def calls_per_repeat(operation, min_time: float) -> int:
+    """Calls of operation lasting about min_time"""
+    calls = 1
+    while True:
+        elapsed = time_calls(operation, calls)
+        if elapsed >= min_time:
+            return calls
+        calls *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+
+def run_benchmark(name: str, min_time=0.2, repeats=5) -> BenchmarkResult:
+    setup, ops = BENCHMARKS[name]
+    operation = setup()
+
+    # Repeats of the benchmark and of the calibration loop alternate, so both
+    # best times are taken under the same machine load
+    calls = calls_per_repeat(operation, min_time)
+    calibration_calls = calls_per_repeat(calibration_loop, min_time)
+    best = best_calibration = math.inf
+    for _ in range(repeats):
+        best = min(best, time_calls(operation, calls))
+        best_calibration = min(
+            best_calibration, time_calls(calibration_loop, calibration_calls)
+        )
+
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ops_per_sec = calls * ops / best
+    calibrations_per_sec = calibration_calls / best_calibration
+    return BenchmarkResult(
+        name, ops_per_sec, peak / ops, ops_per_sec / calibrations_per_sec
+    )
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: list[BenchmarkResult]) -> None:
+    """Stores the results, keeping baseline entries of benchmarks not run"""
+    baseline = load_baseline(path)
+    baseline.update((result.name, result.to_json()) for result in results)
+    with open(path, "w") as baseline_file:
+        json.dump(
+            baseline,
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
+
+
+def find_regressions(results, baseline: dict, tolerance: float) -> list[str]:
+    """Messages for results slower or hungrier than the baseline beyond tolerance"""
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        if result.relative_speed < expected["relative_speed"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: {result.relative_speed:,.4f} rel,"
+                f" baseline {expected['relative_speed']:,.4f} rel"
+            )
+        # A few bytes of slack, tracemalloc counts some interpreter noise
+        allowed_bytes = expected["bytes_per_op"] * (1 + tolerance) + 16
+        if result.bytes_per_op > allowed_bytes:
+            regressions.append(
+                f"{result.name}: {result.bytes_per_op:,.1f} B/op,"
+                f" baseline {expected['bytes_per_op']:,.1f} B/op"
+            )
+    return regressions
@@ -0,0 +1,93 @@
+from benchmark import benchmark
+from src.common import Deck, RandomStream
+from src.simply_blackjack.blackjack_card import BlackJackCard
+from src.simply_blackjack.blackjack_dealer import BlackJackDealer
+from src.war.batch_simulator import random_decks, simulate_war_games
+from src.war.main import play_round as play_war_round
+from src.war.player import Player as WarPlayer
+from src.war.war_card import WarGameCard
+
+"""
+Benchmarks of the card_games hot paths, imported by run_benchmarks.py once
+the card_games folder is on sys.path.
+"""
+
+CARDS_PER_CALL = 1000
+
+
+@benchmark("deck.construct")
+def deck_construct():
+    return lambda: Deck(BlackJackCard, rng=RandomStream(0))
+
+
+@benchmark("deck.shuffle")
+def deck_shuffle():
+    deck = Deck(BlackJackCard, rng=RandomStream(0))
+    return deck.shuffle
+
+
+@benchmark("deck.deal_all", ops=52)
+def deck_deal_all():
+    deck = Deck(BlackJackCard, rng=RandomStream(0))
+
+    def deal_all():
+        deck.reshuffle()
+        for _ in range(52):
+            deck.deal_one()
+
+    return deal_all
+
+
+@benchmark("blackjack_card.value", ops=CARDS_PER_CALL)
+def blackjack_card_value():
+    cards = [BlackJackCard.from_index(index % 52) for index in range(CARDS_PER_CALL)]
+    return lambda: sum(card.value for card in cards)
+
+
+@benchmark("war_card.value", ops=CARDS_PER_CALL)
+def war_card_value():
+    cards = [WarGameCard.from_index(index % 52) for index in range(CARDS_PER_CALL)]
+    return lambda: sum(card.value for card in cards)
+
+
+@benchmark("blackjack.hand_value", ops=4)
+def blackjack_hand_value():
+    dealer = BlackJackDealer()
+    hand = [BlackJackCard.from_index(index) for index in (0, 13, 22, 35)]
+
+    def evaluate_hand():
+        dealer.reset_match_cards()
+        for card in hand:
+            dealer.add_cards(card)
+            dealer.get_hand_value()
+
+    return evaluate_hand
+
+
+@benchmark("war.round", ops=1000)
+def war_rounds():
+    """Rounds of war/main.py, a new game is dealt whenever one ends"""
+    cards = [WarGameCard.from_index(index) for index in range(52)]
+    rng = RandomStream(0)
+
+    def play_rounds():
+        rounds = 0
+        while rounds < 1000:
+            rng.shuffle(cards)
+            first, second = WarPlayer("One"), WarPlayer("Two")
+            first.add_cards(cards[:26])
+            second.add_cards(cards[26:])
+            round_lines = []
+            game_on = True
+            while rounds < 1000 and game_on and first.all_cards and second.all_cards:
+                rounds += 1
+                game_on = play_war_round(first, second, round_lines)
+                round_lines.clear()
+
+    return play_rounds
+
+
+@benchmark("war.batch_game", ops=100)
+def war_batch_games():
+    decks = random_decks(100, RandomStream(0))
+    return lambda: simulate_war_games(decks)
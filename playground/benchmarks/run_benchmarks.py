@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+
+"""
+Runs the performance benchmarks of card_games, tricky_game and web_scrapper
+and compares them with baseline.json: any benchmark slower (speed relative to
+the calibration loop, see benchmark.py) or allocating more (bytes/op) than the
+baseline beyond the tolerance fails the run.
+
+    python run_benchmarks.py                   # run and compare
+    python run_benchmarks.py --filter tricky   # only matching benchmarks
+    python run_benchmarks.py --save-baseline   # store results as the baseline
+"""
+
+PLAYGROUND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# card_games is imported as the `src` package, the others as top level modules
+sys.path[1:1] = [
+    os.path.join(PLAYGROUND, "card_games"),
+    os.path.join(PLAYGROUND, "tricky_game"),
+    os.path.join(PLAYGROUND, "web_scrapper"),
+]
+
+import card_benchmarks  # noqa: E402,F401 registers the benchmarks
+import scrapper_benchmarks  # noqa: E402,F401
+import tricky_benchmarks  # noqa: E402,F401
+from benchmark import (  # noqa: E402
+    BENCHMARKS,
+    find_regressions,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="card_games and tricky_game benchmarks"
+    )
+    parser.add_argument("--filter", default="", help="run names containing this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.3, help="allowed relative regression"
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    arguments = parser.parse_args()
+
+    results = []
+    for name in sorted(BENCHMARKS):
+        if arguments.filter in name:
+            result = run_benchmark(name, arguments.min_time)
+            print(result)
+            results.append(result)
+
+    if arguments.save_baseline:
+        save_baseline(arguments.baseline, results)
+        print(f"Baseline saved to {arguments.baseline}")
+        return 0
+
+    regressions = find_regressions(
+        results, load_baseline(arguments.baseline), arguments.tolerance
+    )
+    if regressions:
+        print(f"\nREGRESSIONS ({len(regressions)}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
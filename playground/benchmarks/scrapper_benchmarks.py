@@ -0,0 +1,46 @@
+import bs4
+
+from benchmark import benchmark
+from extraction import extract_fields
+from fixture_server import page_html
+
+"""
+Benchmarks of the web_scrapper page extraction on a fixture corpus, imported
+by run_benchmarks.py once the web_scrapper folder is on sys.path. One op is
+one page, so bytes/op is the Python memory peak while parsing a page (lxml's
+own C allocations are not traced).
+"""
+
+CORPUS = [page_html(page, 20).encode() for page in range(1, 21)]
+
+
+def corpus_pages(extract):
+    pages = iter(())
+
+    def extract_next_page():
+        nonlocal pages
+        body = next(pages, None)
+        if body is None:
+            pages = iter(CORPUS)
+            body = next(pages)
+        extract(body)
+
+    return extract_next_page
+
+
+@benchmark("scrapper.extract_streaming")
+def scrapper_extract_streaming():
+    return corpus_pages(extract_fields)
+
+
+@benchmark("scrapper.extract_bs4")
+def scrapper_extract_bs4():
+    """The index.py path before streaming extraction: decode, full soup, select"""
+
+    def extract(body):
+        soup = bs4.BeautifulSoup(body.decode(), "lxml")
+        authors = [author.text for author in soup.select(".author")]
+        quotes = [quote.text for quote in soup.select(".text")]
+        return authors, quotes
+
+    return corpus_pages(extract)
@@ -0,0 +1,65 @@
+import random
+
+from benchmark import benchmark
+from bitboard import TrickyBitBoard
+from move_providers import RandomMoveProvider
+from simulation import play_headless_game
+from tricky_algorithm import verify_tricky_winner
+
+"""
+Benchmarks of the tricky_game hot paths, imported by run_benchmarks.py once
+the tricky_game folder is on sys.path.
+"""
+
+POSITIONS = 512
+
+
+@benchmark("tricky.verify_winner", ops=POSITIONS)
+def tricky_verify_winner():
+    rng = random.Random(0)
+    positions = [rng.sample(range(1, 10), rng.randint(3, 5)) for _ in range(POSITIONS)]
+
+    def verify_all():
+        for moves in positions:
+            verify_tricky_winner(moves)
+
+    return verify_all
+
+
+@benchmark("tricky.bitboard_has_won", ops=9)
+def tricky_bitboard_has_won():
+    def fill_board():
+        board = TrickyBitBoard()
+        for move, box in enumerate((5, 1, 9, 3, 7, 4, 6, 2, 8)):
+            board.mark(move % 2, box)
+            board.has_won(move % 2)
+
+    return fill_board
+
+
+def seeded_games(games: int, **board):
+    """
+    The same `games` random games on every call, so the memory measured on
+    one call doesn't depend on how many calls were timed before it
+    """
+    first_rng, second_rng = random.Random(), random.Random()
+    first = RandomMoveProvider(first_rng)
+    second = RandomMoveProvider(second_rng)
+
+    def play_games():
+        first_rng.seed(1)
+        second_rng.seed(2)
+        for _ in range(games):
+            play_headless_game(first, second, **board)
+
+    return play_games
+
+
+@benchmark("tricky.headless_game", ops=20)
+def tricky_headless_game():
+    return seeded_games(20)
+
+
+@benchmark("tricky.headless_game_15x15", ops=4)
+def tricky_headless_grid_game():
+    return seeded_games(4, size=15, in_a_row=5)
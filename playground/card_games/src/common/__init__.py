@@ -1,2 +1,6 @@
 from .card import *
 from .deck import *
+from .instrumentation import *
+from .output import *
+from .rng import *
+from .shoe import *
@@ -1,13 +1,38 @@
 from abc import ABC, abstractmethod
 
+suits = ("Hearts", "Diamonds", "Spades", "Clubs")
+ranks = (
+    "Two",
+    "Three",
+    "Four",
+    "Five",
+    "Six",
+    "Seven",
+    "Eight",
+    "Nine",
+    "Ten",
+    "Jack",
+    "Queen",
+    "King",
+    "Ace",
+)
+
+"""
+Cards are immutable flyweights: a card type only ever needs the 52 objects
+returned by from_index, where index = suit position * 13 + rank position.
+Decks store those small integers and materialize the shared card objects
+only when a card is dealt or shown.
+"""
+
 
 class Card(ABC):
+    __slots__ = ("_suit", "_rank", "_value")
 
     @abstractmethod
     def __init__(self, suit: str, rank: str):
-        self.suit = suit
-        self.rank = rank
-        self.value = self.card_values[rank]
+        self._suit = suit
+        self._rank = rank
+        self._value = self.card_values[rank]
 
     @abstractmethod
     def __str__(self) -> str:
@@ -17,3 +42,23 @@ class Card(ABC):
     @abstractmethod
     def card_values(self):
         pass
+
+    @property
+    def suit(self) -> str:
+        return self._suit
+
+    @property
+    def rank(self) -> str:
+        return self._rank
+
+    @property
+    def value(self):
+        return self._value
+
+    @classmethod
+    def from_index(cls, index: int) -> "Card":
+        interned = cls.__dict__.get("_interned_cards")
+        if interned is None:
+            interned = tuple(cls(suit, rank) for suit in suits for rank in ranks)
+            cls._interned_cards = interned
+        return interned[index]
@@ -1,23 +1,21 @@
-import random
-
-from .card import Card
-
-suits = ("Hearts", "Diamonds", "Spades", "Clubs")
-ranks = (
-    "Two",
-    "Three",
-    "Four",
-    "Five",
-    "Six",
-    "Seven",
-    "Eight",
-    "Nine",
-    "Ten",
-    "Jack",
-    "Queen",
-    "King",
-    "Ace",
-)
+from array import array
+
+from .card import Card, ranks, suits
+from .output import get_output
+from .rng import RandomStream
+
+DECK_SIZE = len(suits) * len(ranks)
+
+ALL_CARDS_BANNER = """
+        --------------------
+        All cards available
+        --------------------
+            """
+SHUFFLED_BANNER = """
+        -------------------------------------
+        Shuffle perfomed - New cards position
+        -------------------------------------
+            """
 
 
 class Deck:
@@ -25,46 +23,60 @@ class Deck:
     def __init__(
         self,
         Card: Card,
+        rng: RandomStream = None,
     ):
         # Note this only happens once upon creation of a new Deck
         self.Card = Card
+        # Unseeded (OS entropy) unless a stream is given
+        self.rng = rng if rng is not None else RandomStream()
         self.new_deck()
 
+    def __len__(self) -> int:
+        return len(self.cards)
+
     def new_deck(self):
-        self.all_cards = []
-        for suit in suits:
-            for rank in ranks:
-                self.all_cards.append(self.Card(suit, rank))
+        # Cards are kept as their index (see Card.from_index), one byte each
+        self.cards = array("B", range(DECK_SIZE))
+
+    @property
+    def all_cards(self) -> list[Card]:
+        return [self.Card.from_index(index) for index in self.cards]
 
     def shuffle(self):
         # Note this doesn't return anything
-        random.shuffle(self.all_cards)
+        self.rng.shuffle(self.cards)
 
-    def deal_one(self):
-        # Note we remove one card from the list of all_cards
-        return self.all_cards.pop()
+    def reshuffle(self):
+        self.new_deck()
+        self.shuffle()
 
-    def init_match(self):
-        print(
-            """
-        --------------------
-        All cards available
-        --------------------
-            """
-        )
+    @property
+    def needs_reshuffle(self) -> bool:
+        # A single deck has no cut card, it is only renewed when it runs low
+        return False
 
-        for card in self.all_cards:
-            print(card)
+    @property
+    def rank_counts(self) -> tuple:
+        """Cards left per rank, in the order of card.ranks"""
+        counts = [0] * len(ranks)
+        for index in self.cards:
+            counts[index % len(ranks)] += 1
+        return tuple(counts)
 
-        print(
-            """
-        -------------------------------------
-        Shuffle perfomed - New cards position
-        -------------------------------------
-            """
-        )
+    def deal_one(self):
+        # Note we remove one card from the end of the deck
+        return self.Card.from_index(self.cards.pop())
+
+    def init_match(self):
+        output = get_output()
+        if not output.renders:
+            self.shuffle()
+            return
+        output.write_frame([ALL_CARDS_BANNER] + [str(card) for card in self.all_cards])
 
         self.shuffle()
 
-        for card_after_suffle in self.all_cards:
-            print(card_after_suffle)
+        output.write_frame(
+            [SHUFFLED_BANNER]
+            + [str(card_after_suffle) for card_after_suffle in self.all_cards]
+        )
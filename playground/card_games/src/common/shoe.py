@@ -0,0 +1,97 @@
+from array import array
+
+from .card import Card, ranks
+from .deck import DECK_SIZE
+from .rng import RandomStream
+
+"""
+Multi-deck shoe (1-8 decks) with a cut card.
+
+The shoe is never shuffled up front: dealing a card swaps a random card of
+the undealt part into the next position (one Fisher-Yates step), so only the
+cards actually dealt get randomized. Counts per rank and the Hi-Lo running
+count are updated on every deal, so the composition, running count and true
+count of the remaining cards are always available in O(1).
+"""
+
+MAX_DECKS = 8
+# Hi-Lo weight per rank position: Two-Six +1, Seven-Nine 0, Ten-Ace -1
+HI_LO_WEIGHTS = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1)
+
+
+class Shoe:
+
+    def __init__(
+        self,
+        Card: Card,
+        decks: int = 6,
+        penetration: float = 0.75,
+        rng: RandomStream = None,
+    ):
+        if not 1 <= decks <= MAX_DECKS:
+            raise ValueError(f"A shoe holds between 1 and {MAX_DECKS} decks")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.Card = Card
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng if rng is not None else RandomStream()
+        self.__cards = array("B", range(DECK_SIZE)) * decks
+        # Cards before the cut card position are dealt before a reshuffle
+        self.__cut_card = int(len(self.__cards) * penetration)
+        self.reshuffle()
+
+    def __len__(self) -> int:
+        return len(self.__cards) - self.__next_card
+
+    def reshuffle(self) -> None:
+        """Put every dealt card back in the shoe"""
+        self.__next_card = 0
+        self.__rank_counts = [4 * self.decks] * len(ranks)
+        self.running_count = 0
+
+    def new_deck(self) -> None:
+        self.reshuffle()
+
+    def shuffle(self) -> None:
+        # Undealt cards are randomized as they are dealt, nothing to do here
+        pass
+
+    def deal_one(self):
+        cards = self.__cards
+        position = self.__next_card
+        if position >= len(cards):
+            raise IndexError("deal from an empty shoe")
+        swap = self.rng.randrange(position, len(cards))
+        card_index = cards[swap]
+        cards[swap] = cards[position]
+        cards[position] = card_index
+        self.__next_card = position + 1
+
+        rank_position = card_index % len(ranks)
+        self.__rank_counts[rank_position] -= 1
+        self.running_count += HI_LO_WEIGHTS[rank_position]
+        return self.Card.from_index(card_index)
+
+    @property
+    def cards(self) -> array:
+        """Indexes of the undealt cards, in no meaningful order (a copy)"""
+        return self.__cards[self.__next_card :]
+
+    @property
+    def rank_counts(self) -> tuple:
+        """Undealt cards per rank, in the order of card.ranks"""
+        return tuple(self.__rank_counts)
+
+    @property
+    def needs_reshuffle(self) -> bool:
+        return self.__next_card >= self.__cut_card
+
+    @property
+    def decks_remaining(self) -> float:
+        return len(self) / DECK_SIZE
+
+    @property
+    def true_count(self) -> float:
+        decks_remaining = self.decks_remaining
+        return self.running_count / decks_remaining if decks_remaining else 0.0
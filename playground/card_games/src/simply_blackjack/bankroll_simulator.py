@@ -0,0 +1,178 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+from ..common.deck import Deck
+from ..common.rng import RandomStream
+from ..common.shoe import Shoe
+from .bet_pocket import BetPocket
+from .blackjack_card import BlackJackCard
+from .blackjack_dealer import BlackJackDealer
+from .blackjack_player import BlackJackPlayer
+from .game_context import GameContext
+from .strategies import BettingStrategy, PlayingStrategy
+
+"""
+Headless bankroll / risk-of-ruin simulator for simply_blackjack.
+
+Every session is a regular GameContext with a strategy-driven player that
+plays rounds until it can't afford the base bet (ruin), reaches the target
+bankroll or plays max_rounds. Sessions are grouped in fixed-size shards that
+run on worker processes; every session shuffles with its own RandomStream
+derived from the master seed, the shard index and the session index, so the
+merged results don't depend on the worker count.
+"""
+
+
+class BankrollReport:
+
+    def __init__(self):
+        self.sessions = 0
+        self.ruined = 0
+        self.reached_target = 0
+        self.rounds_played = 0
+        self.final_bankroll_total = 0.0
+        # Bankroll after every round for the first sessions (in shard order)
+        self.trajectories = []
+
+    def __str__(self) -> str:
+        return (
+            f"{self.sessions} sessions: risk of ruin {self.risk_of_ruin:.4f}, "
+            f"reached target {self.reached_target}, "
+            f"mean final bankroll {self.mean_final_bankroll:.2f}, "
+            f"rounds played {self.rounds_played}"
+        )
+
+    @property
+    def risk_of_ruin(self) -> float:
+        return self.ruined / self.sessions if self.sessions else 0.0
+
+    @property
+    def mean_final_bankroll(self) -> float:
+        return self.final_bankroll_total / self.sessions if self.sessions else 0.0
+
+    def merge(self, other: "BankrollReport", max_trajectories: int) -> None:
+        self.sessions += other.sessions
+        self.ruined += other.ruined
+        self.reached_target += other.reached_target
+        self.rounds_played += other.rounds_played
+        self.final_bankroll_total += other.final_bankroll_total
+        missing = max_trajectories - len(self.trajectories)
+        self.trajectories.extend(other.trajectories[:missing])
+
+
+def play_session(
+    initial_bankroll,
+    betting_strategy: BettingStrategy,
+    playing_strategy: PlayingStrategy,
+    rng: RandomStream,
+    max_rounds: int,
+    target_bankroll=None,
+    trajectory: list = None,
+    decks: int = 1,
+):
+    """
+    Play one session with a single deck, or a shoe when decks > 1.
+    Returns (final bankroll, rounds played)
+    """
+    pocket = BetPocket(initial_bankroll)
+    player = BlackJackPlayer("simulated", pocket, betting_strategy, playing_strategy)
+    dealer = BlackJackDealer()
+    deck = (
+        Deck(BlackJackCard, rng) if decks == 1 else Shoe(BlackJackCard, decks, rng=rng)
+    )
+    context = GameContext(deck, player, dealer, verbose=False)
+    rounds = 0
+    while rounds < max_rounds and betting_strategy.can_bet(pocket.total_money):
+        if target_bankroll is not None and pocket.total_money >= target_bankroll:
+            break
+        context.play_match()
+        rounds += 1
+        if trajectory is not None:
+            trajectory.append(pocket.total_money)
+    return pocket.total_money, rounds
+
+
+def simulate_shard(
+    shard_index,
+    sessions,
+    initial_bankroll,
+    betting_strategy,
+    playing_strategy,
+    max_rounds,
+    target_bankroll,
+    master_seed,
+    trajectories,
+    decks,
+) -> BankrollReport:
+    """Module level so it can run on a worker process"""
+    shard_stream = RandomStream(master_seed).spawn(shard_index)
+    report = BankrollReport()
+    for session in range(sessions):
+        rng = shard_stream.spawn(session)
+        trajectory = [] if session < trajectories else None
+        final_bankroll, rounds = play_session(
+            initial_bankroll,
+            copy.deepcopy(betting_strategy),
+            playing_strategy,
+            rng,
+            max_rounds,
+            target_bankroll,
+            trajectory,
+            decks,
+        )
+        report.sessions += 1
+        report.rounds_played += rounds
+        report.final_bankroll_total += final_bankroll
+        if not betting_strategy.can_bet(final_bankroll):
+            report.ruined += 1
+        elif target_bankroll is not None and final_bankroll >= target_bankroll:
+            report.reached_target += 1
+        if trajectory is not None:
+            report.trajectories.append(trajectory)
+    return report
+
+
+def simulate_bankrolls(
+    sessions: int,
+    initial_bankroll: int,
+    betting_strategy: BettingStrategy,
+    playing_strategy: PlayingStrategy,
+    max_rounds: int = 1000,
+    target_bankroll=None,
+    master_seed: int = 0,
+    workers: int = None,
+    shard_size: int = 1000,
+    trajectories: int = 0,
+    decks: int = 1,
+) -> BankrollReport:
+    """
+    Shard `sessions` over a process pool (in-process with workers=1).
+    The betting strategy is copied for every session so it starts fresh.
+    """
+    shards = []
+    for shard_index, first_session in enumerate(range(0, sessions, shard_size)):
+        shards.append(
+            (
+                shard_index,
+                min(shard_size, sessions - first_session),
+                initial_bankroll,
+                betting_strategy,
+                playing_strategy,
+                max_rounds,
+                target_bankroll,
+                master_seed,
+                max(0, trajectories - first_session),
+                decks,
+            )
+        )
+
+    if workers == 1:
+        shard_reports = [simulate_shard(*shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_reports = list(executor.map(simulate_shard, *zip(*shards)))
+
+    report = BankrollReport()
+    for shard_report in shard_reports:
+        report.merge(shard_report, trajectories)
+    return report
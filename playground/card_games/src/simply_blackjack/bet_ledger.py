@@ -0,0 +1,159 @@
+import argparse
+import sqlite3
+import threading
+import time
+
+from .bet_pocket import BET, DEPOSIT, BetPocket
+
+"""
+Append-only ledger of every pocket movement, stored in a SQLite database in
+WAL mode. Transactions are queued in memory and written by group commit:
+one INSERT batch + one COMMIT every `flush_interval` seconds or every
+`batch_size` transactions, never one fsync per bet. A crash loses at most
+the last unflushed batch.
+
+Balances are rebuilt as last snapshot + replay of the transactions written
+after it; snapshot() only moves that starting point, the transaction log is
+never rewritten.
+
+Inspect a ledger from the card_games folder:
+    python -m src.simply_blackjack.bet_ledger casino.db
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    account TEXT PRIMARY KEY,
+    balance REAL NOT NULL,
+    seq INTEGER NOT NULL
+);
+"""
+
+REPLAY_QUERY = """
+SELECT account, SUM(CASE kind WHEN ? THEN -amount ELSE amount END)
+FROM transactions WHERE seq > ? AND seq <= ? GROUP BY account
+"""
+
+
+class BetLedger:
+    def __init__(self, path: str, batch_size=1000, flush_interval=0.05):
+        self.batch_size = batch_size
+        self.__pending = []
+        self.__pending_lock = threading.Lock()
+        self.__connection_lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+        self.__balances = self.replay()
+        self.__closed = threading.Event()
+        self.__flusher = threading.Thread(
+            target=self.__flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self.__flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def accounts(self) -> list[str]:
+        return list(self.__balances)
+
+    def balance(self, account: str):
+        """Balance restored at startup, None for unknown accounts"""
+        return self.__balances.get(account)
+
+    def record(self, account: str, kind: int, amount) -> None:
+        with self.__pending_lock:
+            self.__pending.append((account, kind, amount, time.time()))
+            full = len(self.__pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def open_pocket(self, account: str, initial_money) -> BetPocket:
+        """Pocket of account with its ledger balance, opened with a deposit if new"""
+        balance = self.__balances.get(account)
+        if balance is None:
+            balance = initial_money
+            self.__balances[account] = balance
+            self.record(account, DEPOSIT, initial_money)
+        return BetPocket(balance, ledger=self, account=account)
+
+    def flush(self) -> None:
+        with self.__connection_lock:
+            with self.__pending_lock:
+                batch, self.__pending = self.__pending, []
+            if batch:
+                with self.__connection:
+                    self.__connection.executemany(
+                        "INSERT INTO transactions (account, kind, amount, recorded_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        batch,
+                    )
+
+    def replay(self) -> dict:
+        """Balances per account: last snapshot plus the transactions after it"""
+        with self.__connection_lock:
+            return self.__replay()[0]
+
+    def snapshot(self) -> int:
+        """Stores the current balances, returns the seq they are valid up to"""
+        self.flush()
+        with self.__connection_lock, self.__connection:
+            balances, seq = self.__replay()
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO snapshots (account, balance, seq)"
+                " VALUES (?, ?, ?)",
+                [(account, balance, seq) for account, balance in balances.items()],
+            )
+        return seq
+
+    def __replay(self) -> tuple[dict, int]:
+        rows = self.__connection.execute(
+            "SELECT account, balance, seq FROM snapshots"
+        ).fetchall()
+        balances = {account: balance for account, balance, _ in rows}
+        snapshot_seq = max((seq for *_, seq in rows), default=0)
+        last_seq = self.__connection.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM transactions"
+        ).fetchone()[0]
+        for account, change in self.__connection.execute(
+            REPLAY_QUERY, (BET, snapshot_seq, last_seq)
+        ):
+            balances[account] = balances.get(account, 0) + change
+        return balances, max(snapshot_seq, last_seq)
+
+    def close(self) -> None:
+        if self.__closed.is_set():
+            return
+        self.__closed.set()
+        self.__flusher.join()
+        self.flush()
+        self.__connection.close()
+
+    def __flush_periodically(self, flush_interval: float) -> None:
+        while not self.__closed.wait(flush_interval):
+            self.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Balances stored in a bet ledger")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--snapshot", action="store_true", help="store a snapshot of the balances"
+    )
+    arguments = parser.parse_args()
+    with BetLedger(arguments.path) as ledger:
+        if arguments.snapshot:
+            print(f"Snapshot up to transaction {ledger.snapshot()}")
+        for account in sorted(ledger.accounts):
+            print(f"{account}: {ledger.balance(account):.2f}")
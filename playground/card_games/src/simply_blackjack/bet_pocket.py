@@ -1,23 +1,46 @@
+import threading
+
+# Ledger transaction kinds, see bet_ledger.py
+DEPOSIT = 0
+BET = 1
+WON = 2
+
+
 class NotEnoughtMoneyError(Exception):
     pass
 
 
 class BetPocket:
-    def __init__(self, total_money: int):
+    """
+    Balance changes are atomic, so the same pocket can be shared by several
+    tables (tasks or threads) without losing or overdrawing money. With a
+    ledger every change is also recorded for the given account.
+    """
+
+    def __init__(self, total_money: int, ledger=None, account: str = None):
         self.__total_money = total_money
+        self.__lock = threading.Lock()
+        self.__ledger = ledger
+        self.__account = account
 
     @property
     def total_money(self) -> int:
         return self.__total_money
 
     def bet_won(self, amount_won: int) -> None:
-        self.__total_money += amount_won
+        with self.__lock:
+            self.__total_money += amount_won
+            if self.__ledger is not None:
+                self.__ledger.record(self.__account, WON, amount_won)
 
     def bet(self, bet_amount: int) -> int:
-        if bet_amount > self.__total_money:
-            raise NotEnoughtMoneyError(
-                f"Requested to take {bet_amount} coins, but only {self.__total_money} coins are left"
-            )
-        self.__total_money -= bet_amount
+        with self.__lock:
+            if bet_amount > self.__total_money:
+                raise NotEnoughtMoneyError(
+                    f"Requested to take {bet_amount} coins, but only {self.__total_money} coins are left"
+                )
+            self.__total_money -= bet_amount
+            if self.__ledger is not None:
+                self.__ledger.record(self.__account, BET, bet_amount)
 
         return bet_amount
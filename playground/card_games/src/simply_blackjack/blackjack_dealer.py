@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from ..common.output import get_output
 from .player import Player
 
 
@@ -11,21 +12,30 @@ class Dealer(ABC):
 
 class BlackJackDealer(Player, Dealer):
 
+    name = "Dealer"
+
     def __init__(self):
         super().__init__()
 
     def __str__(self):
-        return self.__name
+        return self.name
 
     def show_hand(self) -> None:
-        print("---------------------------------------------")
-        print(f"Dealer all hand:")
-        for card in self.match_cards:
-            print(f"- {card}")
-        print("---------------------------------------------")
+        get_output().write_frame(
+            [
+                "---------------------------------------------",
+                "Dealer all hand:",
+                *(f"- {card}" for card in self.match_cards),
+                "---------------------------------------------",
+            ]
+        )
 
     def show_partial_hand(self) -> None:
-        print("---------------------------------------------")
-        print(f"Dealer partial hand - 1 hidden and 1 shown :")
-        print(f"- {self.match_cards[0]}")
-        print("---------------------------------------------")
+        get_output().write_frame(
+            [
+                "---------------------------------------------",
+                "Dealer partial hand - 1 hidden and 1 shown :",
+                f"- {self.match_cards[0]}",
+                "---------------------------------------------",
+            ]
+        )
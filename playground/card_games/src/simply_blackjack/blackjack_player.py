@@ -1,12 +1,26 @@
+from ..common.output import get_output
 from .bet_pocket import BetPocket, NotEnoughtMoneyError
 from .player import Player
+from .strategies import BettingStrategy, PlayingStrategy
 
 
 class BlackJackPlayer(Player):
+    """
+    Without strategies the player is asked for bets and hit/stand on the
+    terminal; with them every decision is automated (no input at all).
+    """
 
-    def __init__(self, name, BetPocket: BetPocket):
+    def __init__(
+        self,
+        name,
+        BetPocket: BetPocket,
+        betting_strategy: BettingStrategy = None,
+        playing_strategy: PlayingStrategy = None,
+    ):
         self.name = name
         self.__pocket = BetPocket
+        self.betting_strategy = betting_strategy
+        self.playing_strategy = playing_strategy
         super().__init__()
 
     def __str__(self):
@@ -15,13 +29,20 @@ class BlackJackPlayer(Player):
         )
 
     def show_hand(self) -> None:
-        print("---------------------------------------------")
-        print(f"Player {self.name}, this is your hand:")
-        for card in self.match_cards:
-            print(f"- {card}")
-        print("---------------------------------------------")
+        get_output().write_frame(
+            [
+                "---------------------------------------------",
+                f"Player {self.name}, this is your hand:",
+                *(f"- {card}" for card in self.match_cards),
+                "---------------------------------------------",
+            ]
+        )
 
     def request_bet(self) -> int:
+        if self.betting_strategy is not None:
+            return self.__pocket.bet(
+                self.betting_strategy.next_bet(self.__pocket.total_money)
+            )
         while True:
             try:
                 money_amount = int(
@@ -29,9 +50,11 @@ class BlackJackPlayer(Player):
                 )
                 self.__pocket.bet(money_amount)
             except ValueError:
-                print("Please write value that be a number")
+                get_output().write_line("Please write value that be a number")
             except NotEnoughtMoneyError as exc:
-                print("Sorry, your bet can't exceed your total.", str(exc))
+                get_output().write_line(
+                    f"Sorry, your bet can't exceed your total. {exc}"
+                )
             else:
                 break
         return money_amount
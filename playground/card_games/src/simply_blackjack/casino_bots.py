@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import time
+
+from .casino_server import DEFAULT_PORT
+
+"""
+Bot load generator for casino_server.py. Every bot logs in (bots share
+`accounts` bankrolls, so the same pocket plays at several tables), sits at a
+table and plays flat minimum bets, hitting under 17. It reports hands/second
+and the decision latency: from a bot answer to the next server message.
+
+Run from the card_games folder: python -m src.simply_blackjack.casino_bots
+"""
+
+
+async def run_bot(host, port, name, table, rounds, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    hands = 0
+    hand_value = 0
+    answered_at = None
+    try:
+        writer.write(f"LOGIN {name}\nJOIN {table}\n".encode())
+        while hands < rounds:
+            line = await reader.readline()
+            if not line:
+                break
+            if answered_at is not None:
+                latencies.append(time.perf_counter() - answered_at)
+                answered_at = None
+            message = line.decode().split()
+            answer = None
+            if message[0] == "BET":
+                answer = f"BET {message[1]}"
+            elif message[0] == "HAND":
+                hand_value = int(message[1])
+            elif message[0] == "ACTION":
+                answer = "HIT" if hand_value < 17 else "STAND"
+            elif message[0] == "RESULT":
+                hands += 1
+                if float(message[2]) < 1:
+                    break
+            if answer is not None:
+                writer.write(answer.encode() + b"\n")
+                answered_at = time.perf_counter()
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return hands
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host, port, bots, tables, accounts, rounds, seats):
+    latencies = []
+    started = time.perf_counter()
+    hands = await asyncio.gather(
+        *(
+            run_bot(
+                host,
+                port,
+                f"bot{bot % accounts}",
+                bot // seats % tables,
+                rounds,
+                latencies,
+            )
+            for bot in range(bots)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    print(f"{sum(hands)} hands in {elapsed:.2f}s: {sum(hands) / elapsed:.0f} hands/s")
+    if latencies:
+        print(
+            f"decision latency p50 {percentile(latencies, 0.5) * 1000:.2f}ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bots for casino_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bots", type=int, default=50)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=5, help="bots per table")
+    parser.add_argument("--accounts", type=int, default=25)
+    parser.add_argument("--rounds", type=int, default=100, help="hands per bot")
+    arguments = parser.parse_args()
+    asyncio.run(
+        run_load(
+            arguments.host,
+            arguments.port,
+            arguments.bots,
+            arguments.tables,
+            arguments.accounts,
+            arguments.rounds,
+            arguments.seats,
+        )
+    )
@@ -0,0 +1,365 @@
+import argparse
+import asyncio
+import logging
+import time
+
+from ..common.instrumentation import EventHooks, Metrics
+from ..common.rng import RandomStream
+from ..common.shoe import Shoe
+from .bet_ledger import BetLedger
+from .bet_pocket import BetPocket
+from .blackjack_card import BlackJackCard
+from .blackjack_dealer import BlackJackDealer
+from .blackjack_player import BlackJackPlayer
+from .game_context import GameContext
+from .strategies import BettingStrategy
+
+"""
+asyncio blackjack casino: many tables in one process, each one a GameContext
+with several seated players and one dealer. Players are remote connections;
+a table only waits on its own players, and bankrolls are per account name, so
+one BetPocket may be shared by connections sitting at different tables.
+With --ledger every bet is recorded and bankrolls survive restarts, with
+--metrics-port event counters and latencies are served at /metrics.
+
+Run from the card_games folder: python -m src.simply_blackjack.casino_server
+
+Line protocol (one command per line):
+
+client -> server
+    LOGIN <name>      use (or open) the account bankroll of name
+    JOIN <table>      sit at a table, 0 to tables - 1
+    BET <amount>      answer to BET, a bet under the minimum sits the round out
+    HIT | STAND       answer to ACTION
+                      (an answer to no open prompt gets an ERROR)
+    QUIT
+
+server -> client
+    WELCOME <bankroll>
+    SEATED <table>
+    BET <minimum bet>
+    HAND <value> <soft 0|1> UP <dealer upcard value>
+    ACTION
+    RESULT WIN|LOSE <bankroll>
+    ERROR <message>
+"""
+
+DEFAULT_PORT = 8766
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteBetting(BettingStrategy):
+    """Returns the bet the table received from the remote client"""
+
+    pending_bet = 0
+
+    def next_bet(self, total_money) -> int:
+        return self.pending_bet
+
+
+class Seat:
+    def __init__(
+        self, writer: asyncio.StreamWriter, player: BlackJackPlayer, pocket: BetPocket
+    ):
+        self.writer = writer
+        self.player = player
+        self.pocket = pocket
+        self.answers = asyncio.Queue()
+        self.left = False
+        # Answers accepted for the prompt outstanding, none between prompts
+        self.expected = ()
+
+    def send(self, line: str) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+    def prompt(self, line: str, expected: tuple) -> None:
+        """Sends a prompt, dropping answers left over from earlier ones"""
+        while not self.answers.empty():
+            self.answers.get_nowait()
+        self.expected = expected
+        self.send(line)
+
+    def take_answer(self, command: str) -> bool:
+        """Queues the answer if it matches the prompt outstanding"""
+        if command.split(" ")[0] not in self.expected:
+            return False
+        self.expected = ()
+        self.answers.put_nowait(command)
+        return True
+
+    async def answer(self, timeout: float):
+        """Next answer of the client, None if it left or timed out"""
+        if self.left:
+            return None
+        try:
+            return await asyncio.wait_for(self.answers.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.expected = ()
+
+
+class CasinoTable:
+    def __init__(
+        self, table_id, rng, decks, min_bet, decision_timeout, max_seats, hooks=None
+    ):
+        self.table_id = table_id
+        self.min_bet = min_bet
+        self.decision_timeout = decision_timeout
+        self.max_seats = max_seats
+        self.seats: list[Seat] = []
+        self.hands_played = 0
+        self.context = GameContext(
+            Shoe(BlackJackCard, decks, rng=rng),
+            [],
+            BlackJackDealer(),
+            verbose=False,
+            hooks=hooks,
+        )
+        self.hooks = hooks
+        self.__seat_taken = asyncio.Event()
+
+    def sit(self, seat: Seat) -> bool:
+        if len(self.seats) >= self.max_seats:
+            return False
+        self.seats.append(seat)
+        self.__seat_taken.set()
+        return True
+
+    async def run(self) -> None:
+        while True:
+            self.seats = [seat for seat in self.seats if not seat.left]
+            if not self.seats:
+                self.__seat_taken.clear()
+                await self.__seat_taken.wait()
+                continue
+            try:
+                await self.play_round(list(self.seats))
+            except Exception:
+                # A failed round must not take the whole table down
+                logger.exception("Round failed at table %s", self.table_id)
+
+    async def play_round(self, seats: list[Seat]) -> None:
+        for seat in seats:
+            seat.prompt(f"BET {self.min_bet}", ("BET",))
+        answers = await asyncio.gather(
+            *(seat.answer(self.decision_timeout) for seat in seats)
+        )
+        # No await from here to start_round, so no other table can spend the
+        # money of a shared pocket in between. The same account may sit twice
+        # at this table, so bets are checked against the pocket running total
+        round_seats = []
+        pocket_bets = {}
+        for seat, answer in zip(seats, answers):
+            bet = self.__parse_bet(seat, answer, pocket_bets.get(seat.pocket, 0))
+            if bet is not None:
+                seat.player.betting_strategy.pending_bet = bet
+                pocket_bets[seat.pocket] = pocket_bets.get(seat.pocket, 0) + bet
+                round_seats.append(seat)
+        if not round_seats:
+            return
+
+        players = self.context.start_round([seat.player for seat in round_seats])
+        for seat in round_seats:
+            if seat.player not in players:
+                seat.send("ERROR bet exceeds your bankroll")
+        round_seats = [seat for seat in round_seats if seat.player in players]
+        for seat in round_seats:
+            self.__send_hand(seat)
+        for seat in round_seats:
+            while True:
+                seat.prompt("ACTION", ("HIT", "STAND"))
+                if await self.__decide(seat) != "HIT":
+                    break
+                busted = self.context.hit(seat.player)
+                self.__send_hand(seat)
+                if busted:
+                    break
+
+        results = self.context.finish_round()
+        self.hands_played += len(results)
+        for seat in round_seats:
+            outcome = "WIN" if results[seat.player] else "LOSE"
+            seat.send(f"RESULT {outcome} {seat.player.show_total_cash():.2f}")
+        # A client gone mid round is noticed by handle_client, not the table
+        await asyncio.gather(
+            *(seat.writer.drain() for seat in round_seats if not seat.left),
+            return_exceptions=True,
+        )
+
+    async def __decide(self, seat: Seat):
+        if self.hooks is None:
+            return await seat.answer(self.decision_timeout)
+        asked_at = time.perf_counter()
+        answer = await seat.answer(self.decision_timeout)
+        self.hooks.emit(
+            "decision",
+            player=seat.player.name,
+            hit=answer == "HIT",
+            duration=time.perf_counter() - asked_at,
+        )
+        return answer
+
+    def __parse_bet(self, seat: Seat, answer, already_bet: int):
+        if answer is None or not answer.startswith("BET "):
+            return None
+        try:
+            bet = int(answer[4:])
+        except ValueError:
+            seat.send("ERROR bet must be a number")
+            return None
+        if bet < self.min_bet:
+            return None
+        if already_bet + bet > seat.pocket.total_money:
+            seat.send("ERROR bet exceeds your bankroll")
+            return None
+        return bet
+
+    def __send_hand(self, seat: Seat) -> None:
+        player = seat.player
+        upcard = self.context.dealer.match_cards[0]
+        seat.send(
+            f"HAND {player.get_hand_value()} {int(player.is_soft)} UP {upcard.value}"
+        )
+
+
+class CasinoServer:
+    def __init__(
+        self,
+        tables=10,
+        decks=6,
+        min_bet=10,
+        initial_bankroll=1000,
+        decision_timeout=10.0,
+        max_seats=5,
+        seed=None,
+        ledger: BetLedger = None,
+        hooks: EventHooks = None,
+    ):
+        streams = RandomStream(seed)
+        self.initial_bankroll = initial_bankroll
+        self.ledger = ledger
+        self.accounts: dict[str, BetPocket] = {}
+        self.tables = [
+            CasinoTable(
+                table_id,
+                streams.spawn(table_id),
+                decks,
+                min_bet,
+                decision_timeout,
+                max_seats,
+                hooks,
+            )
+            for table_id in range(tables)
+        ]
+        self._table_tasks = []
+
+    @property
+    def hands_played(self) -> int:
+        return sum(table.hands_played for table in self.tables)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT) -> asyncio.Server:
+        self._table_tasks = [asyncio.create_task(table.run()) for table in self.tables]
+        return await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+
+    async def handle_client(self, reader, writer) -> None:
+        pocket = None
+        seat = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip()
+                if command == "QUIT":
+                    break
+                if command.startswith("LOGIN ") and seat is None:
+                    name = command[6:]
+                    pocket = self.__open_pocket(name)
+                    writer.write(f"WELCOME {pocket.total_money:.2f}\n".encode())
+                elif (
+                    command.startswith("JOIN ") and pocket is not None and seat is None
+                ):
+                    seat = self.__join(writer, name, pocket, command[5:])
+                elif seat is None or not seat.take_answer(command):
+                    writer.write(b"ERROR unexpected command\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if seat is not None:
+                seat.left = True
+                seat.answers.put_nowait(None)
+            writer.close()
+
+    def __open_pocket(self, name: str) -> BetPocket:
+        if name not in self.accounts:
+            if self.ledger is None:
+                self.accounts[name] = BetPocket(self.initial_bankroll)
+            else:
+                self.accounts[name] = self.ledger.open_pocket(
+                    name, self.initial_bankroll
+                )
+        return self.accounts[name]
+
+    def __join(self, writer, name, pocket, table_id):
+        try:
+            table_number = int(table_id)
+        except ValueError:
+            table_number = -1
+        if not 0 <= table_number < len(self.tables):
+            writer.write(b"ERROR unknown table\n")
+            return None
+        player = BlackJackPlayer(name, pocket, betting_strategy=RemoteBetting(0))
+        seat = Seat(writer, player, pocket)
+        if not self.tables[table_number].sit(seat):
+            writer.write(b"ERROR table is full\n")
+            return None
+        writer.write(f"SEATED {table_number}\n".encode())
+        return seat
+
+
+async def main(arguments, ledger):
+    hooks = None
+    if arguments.metrics_port is not None:
+        hooks = EventHooks()
+        Metrics(hooks).serve(arguments.host, arguments.metrics_port)
+    casino = CasinoServer(
+        arguments.tables,
+        arguments.decks,
+        arguments.min_bet,
+        arguments.bankroll,
+        arguments.decision_timeout,
+        arguments.max_seats,
+        ledger=ledger,
+        hooks=hooks,
+    )
+    server = await casino.serve(arguments.host, arguments.port)
+    print(f"Casino with {arguments.tables} tables on {arguments.host}:{arguments.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-table blackjack server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--min-bet", type=int, default=10)
+    parser.add_argument("--bankroll", type=int, default=1000)
+    parser.add_argument("--decision-timeout", type=float, default=10.0)
+    parser.add_argument("--max-seats", type=int, default=5)
+    parser.add_argument("--ledger", help="SQLite file recording every bet")
+    parser.add_argument("--metrics-port", type=int, help="serve metrics over HTTP")
+    arguments = parser.parse_args()
+    ledger = BetLedger(arguments.ledger) if arguments.ledger else None
+    try:
+        asyncio.run(main(arguments, ledger))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if ledger is not None:
+            ledger.close()
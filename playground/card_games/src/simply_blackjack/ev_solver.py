@@ -0,0 +1,243 @@
+from ..common.card import ranks
+from ..common.deck import Deck
+from ..common.shoe import Shoe
+from .strategies import PlayingStrategy
+
+"""
+Exact expected value of hit and stand for simply_blackjack hands.
+
+The EV is computed over the exact remaining shoe composition (counts of
+Aces, 2..9 and ten-valued cards), with the rules of GameContext:
+- the dealer hits until the hand value reaches dealer_stands_on (17), an
+  Ace counting as 11 whenever it doesn't bust
+- a winning player takes the bet pot, i.e. wins win_payout (0.7) times the
+  bet; a bust or a tie loses the bet
+- no doubling, splitting or surrender
+
+Results are memoized per composition, so evaluating several hands of the same
+(or a slightly depleted) shoe mostly reuses cached dealer distributions. Every
+new composition adds ~100k entries, so the caches are dropped once they hold
+max_cached dealer distributions (long simulations would run out of memory).
+EVs are in units of the player's bet.
+"""
+
+ACE, TEN = 0, 9
+# Composition slot (0 Ace, 1..8 for 2..9, 9 ten-valued) of every rank
+RANK_SLOTS = {rank: min(position + 1, TEN) for position, rank in enumerate(ranks)}
+RANK_SLOTS["Ace"] = ACE
+SLOT_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+BUST = 22
+
+
+def shoe_composition(decks: int = 1) -> tuple:
+    return tuple(4 * decks if slot != TEN else 16 * decks for slot in range(10))
+
+
+def deck_composition(deck: Deck | Shoe, hidden_cards=()) -> tuple:
+    """Composition of the cards left in a deck plus the cards still unseen"""
+    counts = [0] * 10
+    for rank, count in zip(ranks, deck.rank_counts):
+        counts[RANK_SLOTS[rank]] += count
+    for card in hidden_cards:
+        counts[RANK_SLOTS[card.rank]] += 1
+    return tuple(counts)
+
+
+def remove_cards(composition: tuple, slots) -> tuple:
+    counts = list(composition)
+    for slot in slots:
+        counts[slot] -= 1
+    return tuple(counts)
+
+
+def best_value(hard_total: int, has_ace: bool) -> int:
+    if has_ace and hard_total + 10 <= 21:
+        return hard_total + 10
+    return hard_total
+
+
+class EVSolver:
+
+    def __init__(
+        self,
+        dealer_stands_on: int = 17,
+        win_payout: float = 0.7,
+        max_cached: int = 500_000,
+    ):
+        self.dealer_stands_on = dealer_stands_on
+        self.win_payout = win_payout
+        self.max_cached = max_cached
+        self._dealer_cache = {}
+        self._stand_cache = {}
+        self._hit_cache = {}
+
+    def clear_cache(self) -> None:
+        self._dealer_cache.clear()
+        self._stand_cache.clear()
+        self._hit_cache.clear()
+
+    def dealer_outcomes(self, composition: tuple, hard_total: int, has_ace: bool):
+        """
+        Probabilities of the dealer final values from a partial hand, as a
+        tuple indexed by final value (0..21) plus BUST at index 22.
+        """
+        key = (composition, hard_total, has_ace)
+        outcomes = self._dealer_cache.get(key)
+        if outcomes is not None:
+            return outcomes
+
+        value = best_value(hard_total, has_ace)
+        result = [0.0] * (BUST + 1)
+        if hard_total > 21:
+            result[BUST] = 1.0
+        elif value >= self.dealer_stands_on:
+            result[value] = 1.0
+        else:
+            cards_left = sum(composition)
+            counts = list(composition)
+            for slot, count in enumerate(composition):
+                if not count:
+                    continue
+                probability = count / cards_left
+                counts[slot] -= 1
+                drawn = self.dealer_outcomes(
+                    tuple(counts),
+                    hard_total + SLOT_VALUES[slot],
+                    has_ace or slot == ACE,
+                )
+                counts[slot] += 1
+                for final, final_probability in enumerate(drawn):
+                    if final_probability:
+                        result[final] += probability * final_probability
+        outcomes = tuple(result)
+        self._dealer_cache[key] = outcomes
+        return outcomes
+
+    def stand_ev(self, composition, hard_total, has_ace, upcard_slot) -> float:
+        player_value = best_value(hard_total, has_ace)
+        key = (composition, player_value, upcard_slot)
+        ev = self._stand_cache.get(key)
+        if ev is None:
+            outcomes = self.dealer_outcomes(
+                composition, SLOT_VALUES[upcard_slot], upcard_slot == ACE
+            )
+            # Ties go to the house, like GameContext.__is_player_winner
+            win = outcomes[BUST] + sum(outcomes[:player_value])
+            ev = self.win_payout * win - (1.0 - win)
+            self._stand_cache[key] = ev
+        return ev
+
+    def hit_ev(self, composition, hard_total, has_ace, upcard_slot) -> float:
+        """EV of taking one card and then playing the best way"""
+        key = (composition, hard_total, has_ace, upcard_slot)
+        ev = self._hit_cache.get(key)
+        if ev is not None:
+            return ev
+
+        ev = 0.0
+        cards_left = sum(composition)
+        counts = list(composition)
+        for slot, count in enumerate(composition):
+            if not count:
+                continue
+            probability = count / cards_left
+            new_total = hard_total + SLOT_VALUES[slot]
+            if new_total > 21:
+                ev -= probability
+                continue
+            counts[slot] -= 1
+            ev += probability * self.best_ev(
+                tuple(counts), new_total, has_ace or slot == ACE, upcard_slot
+            )
+            counts[slot] += 1
+        self._hit_cache[key] = ev
+        return ev
+
+    def best_ev(self, composition, hard_total, has_ace, upcard_slot) -> float:
+        if best_value(hard_total, has_ace) == 21:
+            return self.stand_ev(composition, hard_total, has_ace, upcard_slot)
+        return max(
+            self.stand_ev(composition, hard_total, has_ace, upcard_slot),
+            self.hit_ev(composition, hard_total, has_ace, upcard_slot),
+        )
+
+    def decide(self, composition, player_slots, upcard_slot):
+        """
+        ("hit" or "stand", hit EV, stand EV) for a hand given as composition
+        slots. The composition must already exclude the visible cards.
+        """
+        if len(self._dealer_cache) > self.max_cached:
+            self.clear_cache()
+        hard_total = sum(SLOT_VALUES[slot] for slot in player_slots)
+        has_ace = ACE in player_slots
+        stand = self.stand_ev(composition, hard_total, has_ace, upcard_slot)
+        hit = self.hit_ev(composition, hard_total, has_ace, upcard_slot)
+        return ("hit" if hit > stand else "stand"), hit, stand
+
+    def basic_strategy_chart(self, decks: int = 1) -> dict:
+        """
+        {(hand label, upcard label): "H" or "S"} for hard 5-20 and soft
+        13-20 hands, using a representative two-card hand for every total.
+        """
+        chart = {}
+        hands = {f"hard {total}": _hard_hand(total) for total in range(5, 21)}
+        hands.update({f"soft {total}": (ACE, total - 12) for total in range(13, 21)})
+        full_shoe = shoe_composition(decks)
+        for label, player_slots in hands.items():
+            for upcard_slot in range(10):
+                composition = remove_cards(full_shoe, player_slots + (upcard_slot,))
+                action = self.decide(composition, player_slots, upcard_slot)[0]
+                chart[(label, _slot_label(upcard_slot))] = (
+                    "H" if action == "hit" else "S"
+                )
+        return chart
+
+
+def _hard_hand(total: int) -> tuple:
+    """Two non-Ace composition slots adding up to total"""
+    high = min(10, total - 2)
+    return (total - high - 1, high - 1)
+
+
+def _slot_label(slot: int) -> str:
+    return "A" if slot == ACE else str(SLOT_VALUES[slot])
+
+
+def format_chart(chart: dict) -> str:
+    upcards = [_slot_label(slot) for slot in list(range(1, 10)) + [ACE]]
+    hands = list(dict.fromkeys(hand for hand, _ in chart))
+    lines = ["".ljust(9) + " ".join(upcard.rjust(2) for upcard in upcards)]
+    for hand in hands:
+        actions = " ".join(chart[(hand, upcard)].rjust(2) for upcard in upcards)
+        lines.append(hand.ljust(9) + actions)
+    return "\n".join(lines)
+
+
+class ExactPlayingStrategy(PlayingStrategy):
+    """
+    Hits whenever the exact EV of hitting beats standing for the cards left
+    in the deck; the dealer's hidden cards are counted as still unseen.
+    The deck and dealer are the ones of the GameContext the player sits at,
+    so it plays in simulate_bankrolls like any other PlayingStrategy.
+    """
+
+    def __init__(self, solver: EVSolver = None):
+        self.solver = solver if solver is not None else EVSolver()
+        self.deck = None
+        self.dealer = None
+
+    def sit(self, deck: Deck | Shoe, dealer) -> None:
+        self.deck = deck
+        self.dealer = dealer
+
+    def should_hit(self, player, dealer_upcard) -> bool:
+        composition = deck_composition(self.deck, self.dealer.match_cards[1:])
+        player_slots = tuple(RANK_SLOTS[card.rank] for card in player.match_cards)
+        action = self.solver.decide(
+            composition, player_slots, RANK_SLOTS[dealer_upcard.rank]
+        )[0]
+        return action == "hit"
+
+
+if __name__ == "__main__":
+    print(format_chart(EVSolver().basic_strategy_chart()))
@@ -1,4 +1,10 @@
+from time import perf_counter
+
 from ..common.deck import Deck
+from ..common.instrumentation import EventHooks
+from ..common.output import get_output
+from ..common.shoe import Shoe
+from .bet_pocket import NotEnoughtMoneyError
 from .blackjack_dealer import BlackJackDealer
 from .blackjack_player import BlackJackPlayer
 
@@ -17,65 +23,167 @@ from .blackjack_player import BlackJackPlayer
 - Ask the Player if they'd like to play again
 """
 
+# Most cards a hand can hold without busting: four Aces, four 2s and three 3s
+MAX_HAND_CARDS = 11
+
 
 class GameContext:
+    """
+    Runs rounds for one or more seated players against the same dealer.
+    play_match plays a whole round deciding through the players (terminal or
+    strategies); start_round, hit and finish_round expose the same round step
+    by step for callers that collect decisions themselves (e.g. a server).
+    """
 
     def __init__(
         self,
-        deck: Deck,
-        player: BlackJackPlayer,
+        deck: Deck | Shoe,
+        player: BlackJackPlayer | list[BlackJackPlayer],
         dealer: BlackJackDealer,
         dealer_max_val_criteria: int = 17,
+        verbose: bool = True,
+        reshuffle_at: int = None,
+        hooks: EventHooks = None,
     ):
-        self.__deck: Deck = deck
-        self.__player: BlackJackPlayer = player
+        self.__deck: Deck | Shoe = deck
+        self.__players: list[BlackJackPlayer] = (
+            list(player) if isinstance(player, list) else [player]
+        )
         self.__dealer: BlackJackDealer = dealer
+        for seated in self.__players:
+            if seated.playing_strategy is not None:
+                seated.playing_strategy.sit(deck, dealer)
         self.__deck.shuffle()
         self.__dealer_max_val_criteria = dealer_max_val_criteria
-        self.__bet_pot = 0
+        # Bet pot and bust state of every player in the current round
+        self.__bet_pots: dict[BlackJackPlayer, float] = {}
+        self.__busted_players: set[BlackJackPlayer] = set()
+        # Headless matches (simulations) don't print anything
+        self.__verbose = verbose
+        # The deck is reshuffled at the cut card or when fewer cards are left,
+        # by default the 11 cards a hand can take at most for every hand
+        self.__reshuffle_at = reshuffle_at
+        # Instrumentation is skipped entirely (no clock reads) without hooks
+        self.__hooks = hooks
+        self.__round_started_at = None
+
+    @property
+    def players(self) -> list[BlackJackPlayer]:
+        return self.__players
+
+    @property
+    def dealer(self) -> BlackJackDealer:
+        return self.__dealer
+
+    def seat_player(self, player: BlackJackPlayer) -> None:
+        self.__players.append(player)
+
+    def remove_player(self, player: BlackJackPlayer) -> None:
+        self.__players.remove(player)
 
     def start_game(self):
         is_game_active = True
         while is_game_active:
             self.play_match()
             ask_play_again = input(
-                f"Do you want to play again Player: {self.__player.name}? : "
+                f"Do you want to play again Player: {self.__players[0].name}? : "
             )
 
             if ask_play_again.lower() == "no":
                 is_game_active = False
 
     def play_match(self):
-        print("playing a new match/round")
-        player_bet = self.__player.request_bet()
-        dealer_bet = player_bet * 0.7
-        self.__bet_pot += player_bet + dealer_bet
-        self.__first_card_deal()
-        is_player_busted = self.__play_player_hand(self.__player)
+        round_players = self.start_round()
+        for player in round_players:
+            self.__play_player_hand(player)
+        self.finish_round()
+
+    def start_round(self, players: list[BlackJackPlayer] = None):
+        """
+        Take the bets of `players` (all seated players by default) and deal the
+        first cards. Returns the players in the round, a player whose bet can't
+        be paid sits the round out.
+        """
+        self.__log("playing a new match/round")
+        round_players = []
+        for player in self.__players if players is None else players:
+            try:
+                player_bet = player.request_bet()
+            except NotEnoughtMoneyError:
+                continue
+            dealer_bet = player_bet * 0.7
+            self.__bet_pots[player] = player_bet + dealer_bet
+            round_players.append(player)
+        reshuffle_at = self.__reshuffle_at
+        if reshuffle_at is None:
+            reshuffle_at = MAX_HAND_CARDS * (len(round_players) + 1)
+        if self.__deck.needs_reshuffle or len(self.__deck) < reshuffle_at:
+            self.__deck.reshuffle()
+        if self.__hooks is not None:
+            self.__round_started_at = perf_counter()
+            self.__hooks.emit(
+                "round_started", players=[player.name for player in round_players]
+            )
+        self.__first_card_deal(round_players)
+        return round_players
+
+    def hit(self, player: BlackJackPlayer) -> bool:
+        """Deal one card to player. Returns True if the player busted"""
+        self.__deal(player)
+        if self.__verbose:
+            player.show_hand()
+        if player.is_busted():
+            self.__log(f"Ops ! seems that {player.name} has Busted !")
+            self.__busted_players.add(player)
+            if self.__hooks is not None:
+                self.__hooks.emit("bust", player=player.name)
+            return True
+        return False
+
+    def finish_round(self) -> dict[BlackJackPlayer, bool]:
+        """
+        Play the dealer hand, settle every bet and reset the hands.
+        Returns whether each player of the round won.
+        """
         is_dealer_busted = False
-        if not is_player_busted:
+        if any(player not in self.__busted_players for player in self.__bet_pots):
             is_dealer_busted = self.__play_dealer_hand()
-        self.__resolve_match_result(is_player_busted, is_dealer_busted)
+        results = {}
+        for player in self.__bet_pots:
+            results[player] = self.__resolve_match_result(
+                player, player in self.__busted_players, is_dealer_busted
+            )
         self.__reset_match()
+        if self.__hooks is not None:
+            self.__hooks.emit(
+                "round", duration=perf_counter() - self.__round_started_at
+            )
+        return results
 
-    def __first_card_deal(self):
-        dealer_cards = [self.__deck.deal_one() for _ in range(2)]
-        self.__dealer.add_cards(dealer_cards)
-        player_cards = [self.__deck.deal_one() for _ in range(2)]
-        self.__player.add_cards(player_cards)
-        self.__dealer.show_partial_hand()
-        self.__player.show_hand()
+    def __deal(self, player) -> None:
+        card = self.__deck.deal_one()
+        player.add_cards(card)
+        if self.__hooks is not None:
+            self.__hooks.emit("card_dealt", player=player.name, card=str(card))
+
+    def __first_card_deal(self, round_players: list[BlackJackPlayer]):
+        for _ in range(2):
+            self.__deal(self.__dealer)
+        for player in round_players:
+            for _ in range(2):
+                self.__deal(player)
+        if self.__verbose:
+            self.__dealer.show_partial_hand()
+            for player in round_players:
+                player.show_hand()
 
     def __play_player_hand(self, player: BlackJackPlayer) -> bool:
         is_busted = False
         while True:
-            player_choice_stand = self.__is_user_standing()
+            player_choice_stand = self.__is_player_standing(player)
             if player_choice_stand:
                 break
-            player.add_cards(self.__deck.deal_one())
-            player.show_hand()
-            if player.is_busted():
-                print(f"Ops ! seems that {player.name} has Busted !")
+            if self.hit(player):
                 is_busted = True
                 break
 
@@ -84,18 +192,41 @@ class GameContext:
     def __play_dealer_hand(self) -> bool:
         is_busted = False
         while True:
-            self.__dealer.show_hand()
+            if self.__verbose:
+                self.__dealer.show_hand()
             if self.__dealer.is_busted():
-                print(f"Ops ! seems that the dealer/house has Busted !")
+                self.__log(f"Ops ! seems that the dealer/house has Busted !")
+                if self.__hooks is not None:
+                    self.__hooks.emit("bust", player=self.__dealer.name)
                 is_busted = True
                 break
             if self.__dealer.get_hand_value() >= self.__dealer_max_val_criteria:
-                print(f"Dealer Max hand-value criteria has been reached")
+                self.__log(f"Dealer Max hand-value criteria has been reached")
                 break
-            self.__dealer.add_cards(self.__deck.deal_one())
+            self.__deal(self.__dealer)
 
         return is_busted
 
+    def __is_player_standing(self, player: BlackJackPlayer) -> bool:
+        if self.__hooks is None:
+            return self.__decide_standing(player)
+        decision_started_at = perf_counter()
+        is_standing = self.__decide_standing(player)
+        self.__hooks.emit(
+            "decision",
+            player=player.name,
+            hit=not is_standing,
+            duration=perf_counter() - decision_started_at,
+        )
+        return is_standing
+
+    def __decide_standing(self, player: BlackJackPlayer) -> bool:
+        if player.playing_strategy is None:
+            return self.__is_user_standing()
+        return not player.playing_strategy.should_hit(
+            player, self.__dealer.match_cards[0]
+        )
+
     def __is_user_standing(self):
         user_choice_stand = False
         while True:
@@ -103,38 +234,56 @@ class GameContext:
             if x[0].lower() == "h":
                 break
             elif x[0].lower() == "s":
-                print("Player stands. Dealer is playing.")
+                get_output().write_line("Player stands. Dealer is playing.")
                 user_choice_stand = True
             else:
-                print("Sorry, please try again.")
+                get_output().write_line("Sorry, please try again.")
                 continue
             break
 
         return user_choice_stand
 
     def __reset_match(self):
-        self.__player.reset_match_cards()
+        for player in self.__bet_pots:
+            player.reset_match_cards()
         self.__dealer.reset_match_cards()
-        self.__bet_pot = 0
+        self.__bet_pots = {}
+        self.__busted_players = set()
 
-    def __resolve_match_result(self, is_player_busted: bool, is_dealer_busted: bool):
-        is_player_winner = self.__is_player_winner(is_player_busted, is_dealer_busted)
-        dealer_winner_message = f"oh sorry, player {self.__player.name} you have lost your bet. The house has won the bet pot {self.__bet_pot}"
-        player_winner_message = f"Congrats player {self.__player.name} you have win the bet pot {self.__bet_pot}. House lost"
+    def __resolve_match_result(
+        self, player: BlackJackPlayer, is_player_busted: bool, is_dealer_busted: bool
+    ) -> bool:
+        bet_pot = self.__bet_pots[player]
+        is_player_winner = self.__is_player_winner(
+            player, is_player_busted, is_dealer_busted
+        )
         if is_player_winner:
-            print(player_winner_message)
-            self.__player.bet_win(self.__bet_pot)
-            return
+            self.__log(
+                f"Congrats player {player.name} you have win the bet pot {bet_pot}. House lost"
+            )
+            player.bet_win(bet_pot)
         else:
-            print(dealer_winner_message)
-            return
+            self.__log(
+                f"oh sorry, player {player.name} you have lost your bet. The house has won the bet pot {bet_pot}"
+            )
+        if self.__hooks is not None:
+            self.__hooks.emit(
+                "bet_settled", player=player.name, won=is_player_winner, pot=bet_pot
+            )
+        return is_player_winner
+
+    def __log(self, message: str) -> None:
+        if self.__verbose:
+            get_output().write_line(message)
 
-    def __is_player_winner(self, is_player_busted: bool, is_dealer_busted: bool):
+    def __is_player_winner(
+        self, player: BlackJackPlayer, is_player_busted: bool, is_dealer_busted: bool
+    ):
         if is_player_busted:
             return False
         if is_dealer_busted:
             return True
         dealer_count = 21 - self.__dealer.get_hand_value()
-        player_count = 21 - self.__player.get_hand_value()
+        player_count = 21 - player.get_hand_value()
 
         return player_count < dealer_count
@@ -20,6 +20,7 @@ special rules
 """
 
 from ..common.deck import Deck
+from ..common.output import get_output
 from .blackjack_card import BlackJackCard
 from .game_context import GameContext
 from .bet_pocket import BetPocket
@@ -38,12 +39,12 @@ def main():
                 )
             )
         except ValueError:
-            print("Please input that be a number")
+            get_output().write_line("Please input that be a number")
         else:
             break
     bet_pocket = BetPocket(player_init_bucket_money)
     player = BlackJackPlayer(player_name, bet_pocket)
     dealer = BlackJackDealer()
-    print(player)
+    get_output().write_line(str(player))
     dealer = GameContext(new_deck, player, dealer)
     dealer.start_game()
@@ -3,9 +3,16 @@ from ..common.card import Card
 
 
 class Player(ABC):
+    """
+    The hand keeps its hard total (every Ace counted as 1) and its number of
+    Aces up to date as cards are added, so the hand value, the soft flag and
+    the bust check are O(1). One Ace counts as 11 whenever it doesn't bust.
+    """
 
     def __init__(self):
         self.__match_cards: list[Card] = []
+        self.__hard_total = 0
+        self.__aces = 0
 
     @abstractmethod
     def __str__(self) -> str:
@@ -19,19 +26,38 @@ class Player(ABC):
     def match_cards(self) -> list[Card]:
         return self.__match_cards
 
+    @property
+    def hard_total(self) -> int:
+        return self.__hard_total
+
+    @property
+    def is_soft(self) -> bool:
+        return self.__aces > 0 and self.__hard_total <= 11
+
     def get_hand_value(self) -> int:
-        total_cards_value = sum([card.value for card in self.__match_cards])
+        if self.__aces and self.__hard_total <= 11:
+            return self.__hard_total + 10
 
-        return total_cards_value
+        return self.__hard_total
 
     def is_busted(self) -> bool:
-        return self.get_hand_value() > 21
+        return self.__hard_total > 21
 
     def reset_match_cards(self) -> None:
         self.__match_cards = []
+        self.__hard_total = 0
+        self.__aces = 0
 
     def add_cards(self, new_cards) -> None:
         if type(new_cards) == type([]):
             self.__match_cards.extend(new_cards)
+            for card in new_cards:
+                self.__count_card(card)
         else:
             self.__match_cards.append(new_cards)
+            self.__count_card(new_cards)
+
+    def __count_card(self, card: Card) -> None:
+        self.__hard_total += card.value
+        if card.is_multi_value:
+            self.__aces += 1
@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+
+"""
+Strategies replace the terminal prompts of a BlackJackPlayer:
+- a BettingStrategy picks the bet of every round from the current bankroll
+- a PlayingStrategy decides hit or stand from the hand and the dealer upcard,
+  strategies that count cards also get the deck and dealer of their table
+"""
+
+
+class BettingStrategy(ABC):
+
+    def __init__(self, base_bet: int):
+        self.base_bet = base_bet
+
+    @abstractmethod
+    def next_bet(self, total_money) -> int:
+        """Bet for the next round, never more than total_money"""
+
+    def can_bet(self, total_money) -> bool:
+        return total_money >= self.base_bet
+
+
+class FlatBetting(BettingStrategy):
+
+    def next_bet(self, total_money) -> int:
+        return min(self.base_bet, total_money)
+
+
+class MartingaleBetting(BettingStrategy):
+    """Doubles the bet after every lost round, back to base_bet after a win"""
+
+    def __init__(self, base_bet: int, max_bet: int = None):
+        super().__init__(base_bet)
+        self.max_bet = max_bet
+        self.__last_total = None
+        self.__last_bet = base_bet
+
+    def next_bet(self, total_money) -> int:
+        bet = self.base_bet
+        if self.__last_total is not None and total_money < self.__last_total:
+            bet = self.__last_bet * 2
+        if self.max_bet is not None:
+            bet = min(bet, self.max_bet)
+        bet = min(bet, total_money)
+        self.__last_total = total_money
+        self.__last_bet = bet
+        return bet
+
+
+class PlayingStrategy(ABC):
+
+    @abstractmethod
+    def should_hit(self, player, dealer_upcard) -> bool:
+        pass
+
+    def sit(self, deck, dealer) -> None:
+        """Called by the GameContext the player is seated at"""
+
+
+class StandOnTotal(PlayingStrategy):
+    """Hits until the hand reaches stand_on, like the dealer rule"""
+
+    def __init__(self, stand_on: int = 17):
+        self.stand_on = stand_on
+
+    def should_hit(self, player, dealer_upcard) -> bool:
+        return player.get_hand_value() < self.stand_on
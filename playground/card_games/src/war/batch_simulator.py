@@ -0,0 +1,276 @@
+import numpy as np
+
+from ..common.card import ranks, suits
+from ..common.deck import DECK_SIZE
+from ..common.rng import RandomStream
+from .state_hash import (
+    HASH_MASK,
+    MULTIPLIER_INVERSE,
+    POWERS,
+    SECOND_HAND_MIX,
+    VALUE_KEYS,
+)
+from .war_card import WarGameCard
+
+"""
+Batch War engine: plays thousands of games in lockstep with NumPy arrays and
+returns the distribution of game length, number of wars and winner.
+
+The rules are exactly the ones of war/main.py:
+- the deck is dealt one card each from its end, player one first
+- each round both players put their top card, the higher one takes the
+  cards on the table, first player one's and then player two's, at the bottom
+- on a tie ("war") a player with less than 5 cards loses the game, player one
+  being checked first, otherwise both put 5 more cards and the last ones compete
+- a player without cards at the start of a round loses
+
+Hands are ring buffers of 52 slots per player, so taking a card from the top
+or adding cards at the bottom only moves the head and count indexes.
+Rounds are counted like war/main.py does, including the round that finds a
+player without cards.
+
+Both hands are hashed incrementally (see state_hash.py) and every game runs
+Brent's cycle detection on the hashes, so a game that repeats a state is
+stopped as a LOOPED draw within about two loop lengths, with O(1) work and
+memory per game and round. Looped games report the round the loop was found.
+"""
+
+# War value of each card index (see Card.from_index)
+CARD_VALUES = np.array(
+    [WarGameCard.card_values[rank] for suit in suits for rank in ranks], dtype=np.int8
+)
+WAR_CARDS = 5
+UNFINISHED = -1
+LOOPED = -2
+
+VALUE_KEY_TABLE = np.zeros(max(VALUE_KEYS) + 1, dtype=np.uint64)
+VALUE_KEY_TABLE[list(VALUE_KEYS)] = list(VALUE_KEYS.values())
+POWER_TABLE = np.array(POWERS, dtype=np.uint64)
+INVERSE_POWER_TABLE = np.array(
+    [pow(MULTIPLIER_INVERSE, size, HASH_MASK + 1) for size in range(DECK_SIZE + 1)],
+    dtype=np.uint64,
+)
+
+
+class WarBatchResult:
+    """
+    Per game arrays: winner (0 player one, 1 player two, LOOPED for a game
+    that repeats forever, UNFINISHED when the game hit max_rounds), rounds
+    and wars.
+    """
+
+    def __init__(self, winners, rounds, wars):
+        self.winners = winners
+        self.rounds = rounds
+        self.wars = wars
+
+    def __str__(self) -> str:
+        finished = self.winners >= 0
+        return (
+            f"{len(self.winners)} games: player one won {self.win_counts[0]}, "
+            f"player two won {self.win_counts[1]}, looped {self.looped}, "
+            f"unfinished {self.unfinished}, "
+            f"average rounds {self.rounds[finished].mean():.1f}, "
+            f"average wars {self.wars[finished].mean():.2f}"
+        )
+
+    @property
+    def win_counts(self):
+        return np.bincount(self.winners[self.winners >= 0], minlength=2)
+
+    @property
+    def looped(self) -> int:
+        return int(np.count_nonzero(self.winners == LOOPED))
+
+    @property
+    def loop_rate(self) -> float:
+        return self.looped / len(self.winners) if len(self.winners) else 0.0
+
+    @property
+    def unfinished(self) -> int:
+        return int(np.count_nonzero(self.winners == UNFINISHED))
+
+    def rounds_histogram(self, bins=50):
+        return np.histogram(self.rounds[self.winners >= 0], bins=bins)
+
+    def wars_distribution(self):
+        """Number of games per number of wars"""
+        return np.bincount(self.wars[self.winners >= 0])
+
+
+def random_decks(games: int, rng: RandomStream = None):
+    """Shuffled decks as card indexes, one row per game"""
+    rng = rng if rng is not None else RandomStream()
+    return rng.permutations(DECK_SIZE, games).astype(np.int8)
+
+
+def deal_hands(decks):
+    """
+    Deal (games, 52) card indexes like war/main.py and return the ring buffer
+    hands of card values, shape (games, 2, 52), top card first.
+    """
+    values = CARD_VALUES[np.asarray(decks)]
+    hands = np.zeros((len(values), 2, DECK_SIZE), dtype=np.int8)
+    dealt = values[:, ::-1]
+    hands[:, 0, : DECK_SIZE // 2] = dealt[:, 0::2]
+    hands[:, 1, : DECK_SIZE // 2] = dealt[:, 1::2]
+    return hands
+
+
+def simulate_war_games(decks, max_rounds: int = 20000) -> WarBatchResult:
+    """Play one game per deck (rows of card indexes, e.g. Deck.cards)"""
+    hands = deal_hands(decks)
+    games = len(hands)
+    heads = np.zeros((games, 2), dtype=np.int64)
+    counts = np.full((games, 2), DECK_SIZE // 2, dtype=np.int64)
+    winners = np.full(games, UNFINISHED, dtype=np.int8)
+    rounds = np.zeros(games, dtype=np.int64)
+    wars = np.zeros(games, dtype=np.int64)
+    active = np.arange(games)
+
+    hashes = (
+        VALUE_KEY_TABLE[hands[:, :, : DECK_SIZE // 2]] * POWER_TABLE[: DECK_SIZE // 2]
+    ).sum(axis=2, dtype=np.uint64)
+    # Brent's cycle detection: a saved state, compared with every new one
+    saved_states = _combine_hands(hashes)
+    saved_power = np.ones(games, dtype=np.int64)
+    since_saved = np.zeros(games, dtype=np.int64)
+    first_round = True
+
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        rounds[active] += 1
+
+        # A player without cards loses before putting any card
+        out_of_cards = counts[active] == 0
+        player_one_out = out_of_cards[:, 0]
+        player_two_out = out_of_cards[:, 1] & ~player_one_out
+        winners[active[player_one_out]] = 1
+        winners[active[player_two_out]] = 0
+        active = active[~(player_one_out | player_two_out)]
+        if not len(active):
+            break
+
+        if not first_round:
+            states = _combine_hands(hashes[active])
+            looped = states == saved_states[active]
+            winners[active[looped]] = LOOPED
+            active = active[~looped]
+            states = states[~looped]
+            since_saved[active] += 1
+            save = since_saved[active] == saved_power[active]
+            games_saving = active[save]
+            saved_states[games_saving] = states[save]
+            saved_power[games_saving] *= 2
+            since_saved[games_saving] = 0
+            if not len(active):
+                break
+        first_round = False
+
+        # Offset of the competing card: 0, then 5, 10... on every war
+        offsets = np.zeros(len(active), dtype=np.int64)
+        at_war = np.ones(len(active), dtype=bool)
+        lost_at_war = np.full(len(active), UNFINISHED, dtype=np.int8)
+        while True:
+            racing = np.nonzero(at_war)[0]
+            games_racing = active[racing]
+            positions = (heads[games_racing] + offsets[racing, None]) % DECK_SIZE
+            cards = np.take_along_axis(
+                hands[games_racing], positions[:, :, None], axis=2
+            )[:, :, 0]
+            tied = cards[:, 0] == cards[:, 1]
+            at_war[racing[~tied]] = False
+            if not tied.any():
+                break
+            tied_games = racing[tied]
+            wars[active[tied_games]] += 1
+            left = counts[active[tied_games]] - offsets[tied_games, None] - 1
+            player_one_short = left[:, 0] < WAR_CARDS
+            player_two_short = (left[:, 1] < WAR_CARDS) & ~player_one_short
+            lost_at_war[tied_games[player_one_short]] = 1
+            lost_at_war[tied_games[player_two_short]] = 0
+            ended = tied_games[player_one_short | player_two_short]
+            at_war[ended] = False
+            offsets[tied_games] += WAR_CARDS
+            offsets[ended] -= WAR_CARDS
+
+        ended_at_war = lost_at_war != UNFINISHED
+        winners[active[ended_at_war]] = lost_at_war[ended_at_war]
+        settle = ~ended_at_war
+        games_settled = active[settle]
+        offsets = offsets[settle]
+        if len(games_settled):
+            positions = (heads[games_settled] + offsets[:, None]) % DECK_SIZE
+            cards = np.take_along_axis(
+                hands[games_settled], positions[:, :, None], axis=2
+            )[:, :, 0]
+            round_winner = (cards[:, 1] > cards[:, 0]).astype(np.int64)
+            _settle_round(
+                hands,
+                heads,
+                counts,
+                hashes,
+                games_settled,
+                offsets + 1,
+                round_winner,
+            )
+        active = active[settle]
+
+    return WarBatchResult(winners, rounds, wars)
+
+
+def _combine_hands(hashes):
+    """Vectorized state_hash.combine_hands over (games, 2) hand hashes"""
+    return hashes[:, 0] ^ (hashes[:, 1] * np.uint64(SECOND_HAND_MIX))
+
+
+def _settle_round(hands, heads, counts, hashes, games, pile_sizes, round_winner):
+    """
+    Move both piles of every game to the bottom of the round winner hand,
+    updating the hand hashes for the cards taken and added.
+    """
+    longest = int(pile_sizes.max())
+    in_pile = np.arange(longest)[None, :] < pile_sizes[:, None]
+    pile_positions = (
+        heads[games][:, :, None] + np.arange(longest)[None, None, :]
+    ) % DECK_SIZE
+    piles = np.take_along_axis(hands[games], pile_positions, axis=2)
+    removed = np.where(
+        in_pile[:, None, :], VALUE_KEY_TABLE[piles] * POWER_TABLE[:longest], 0
+    ).sum(axis=2, dtype=np.uint64)
+    hashes[games] = (hashes[games] - removed) * INVERSE_POWER_TABLE[pile_sizes][:, None]
+
+    winner_rows = np.arange(len(games))
+    tails = heads[games, round_winner] + counts[games, round_winner]
+    destinations = (
+        np.concatenate(
+            [
+                tails[:, None] + np.arange(longest)[None, :],
+                tails[:, None] + pile_sizes[:, None] + np.arange(longest)[None, :],
+            ],
+            axis=1,
+        )
+        % DECK_SIZE
+    )
+    taken = np.concatenate([in_pile, in_pile], axis=1)
+    cards = np.concatenate([piles[:, 0], piles[:, 1]], axis=1)
+
+    heads[games] = (heads[games] + pile_sizes[:, None]) % DECK_SIZE
+    counts[games] -= pile_sizes[:, None]
+    hand_positions = counts[games, round_winner][:, None] + np.concatenate(
+        [
+            np.broadcast_to(np.arange(longest), in_pile.shape),
+            pile_sizes[:, None] + np.arange(longest)[None, :],
+        ],
+        axis=1,
+    )
+    added = np.where(
+        taken,
+        VALUE_KEY_TABLE[cards] * POWER_TABLE[np.where(taken, hand_positions, 0)],
+        0,
+    ).sum(axis=1, dtype=np.uint64)
+    hashes[games, round_winner] += added
+    rows = np.broadcast_to(winner_rows[:, None], taken.shape)[taken]
+    hands[games[rows], round_winner[rows], destinations[taken]] = cards[taken]
+    counts[games, round_winner] += 2 * pile_sizes
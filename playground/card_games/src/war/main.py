@@ -1,5 +1,6 @@
-from ..common import Deck
+from ..common import Deck, get_output
 from .player import Player
+from .state_hash import combine_hands
 from .war_card import WarGameCard
 
 """
@@ -13,10 +14,66 @@ Implement the card game war. Rules are:
     Continue doing this until tie is broken. Winner takes all cards.
 4.  Game is over when a player doesn't have any cards. The player with
     cards remaining is the winner.
+5.  Returned cards go to the bottom in a fixed order, so a game can repeat a
+    previous state and loop forever: that ends the game in a draw.
 """
 # Another good example using Python with OOP game logic: https://gist.github.com/damianesteban/6896120
 
 
+def play_round(player_one: Player, player_two: Player, round_lines: list) -> bool:
+    """
+    Play one round, with its wars, between two players holding cards and add
+    its messages to round_lines. Returns False if the round ended the game.
+    """
+    # Start a new round and reset current cards "on the table"
+    player_one_cards = []
+    player_one_cards.append(player_one.remove_one())
+
+    player_two_cards = []
+    player_two_cards.append(player_two.remove_one())
+
+    while True:
+
+        if player_one_cards[-1].value > player_two_cards[-1].value:
+
+            # Player One gets the cards
+            player_one.add_cards(player_one_cards)
+            player_one.add_cards(player_two_cards)
+
+            # No Longer at "war" , time for next round
+            return True
+
+        # Player Two Has higher Card
+        elif player_one_cards[-1].value < player_two_cards[-1].value:
+
+            # Player Two gets the cards
+            player_two.add_cards(player_one_cards)
+            player_two.add_cards(player_two_cards)
+
+            # No Longer at "war" , time for next round
+            return True
+
+        round_lines.append("WAR!")
+        # This occurs when the cards are equal.
+        # We'll grab another card each and continue the current war.
+        # First check to see if player has enough cards
+        # Check to see if a player is out of cards:
+        if len(player_one.all_cards) < 5:
+            round_lines.append("Player One unable to play war! Game Over at War")
+            round_lines.append("Player Two Wins! Player One Loses!")
+            return False
+
+        elif len(player_two.all_cards) < 5:
+            round_lines.append("Player Two unable to play war! Game Over at War")
+            round_lines.append("Player One Wins! Player One Loses!")
+            return False
+        # Otherwise, we're still at war, so we'll add the next cards
+        else:
+            for num in range(5):
+                player_one_cards.append(player_one.remove_one())
+                player_two_cards.append(player_two.remove_one())
+
+
 def main():
     player_one = Player("One")
     player_two = Player("Two")
@@ -31,74 +88,45 @@ def main():
     game_on = True
 
     round_num = 0
+    seen_states = set()
+    # Messages of a round are written together, as one frame of the output
+    output = get_output()
+    round_lines = []
     while game_on:
+        if round_lines:
+            output.write_frame(round_lines)
+            round_lines = []
 
         round_num += 1
-        print(f"Round {round_num}")
+        round_lines.append(f"Round {round_num}")
 
         # Check to see if a player is out of cards:
         if len(player_one.all_cards) == 0:
-            print("Player One out of cards! Game Over")
-            print("Player Two Wins!")
+            round_lines.append("Player One out of cards! Game Over")
+            round_lines.append("Player Two Wins!")
             game_on = False
             break
 
         if len(player_two.all_cards) == 0:
-            print("Player Two out of cards! Game Over")
-            print("Player One Wins!")
+            round_lines.append("Player Two out of cards! Game Over")
+            round_lines.append("Player One Wins!")
             game_on = False
             break
 
+        state = combine_hands(player_one.hand_hash.value, player_two.hand_hash.value)
+        if state in seen_states:
+            round_lines.append(
+                "Both hands repeat a previous round, the game loops forever!"
+            )
+            round_lines.append("Game Over in a Draw!")
+            game_on = False
+            break
+        seen_states.add(state)
+
         # Otherwise, the game is still on!
-        # Start a new round and reset current cards "on the table"
-        player_one_cards = []
-        player_one_cards.append(player_one.remove_one())
-
-        player_two_cards = []
-        player_two_cards.append(player_two.remove_one())
-
-        at_war = True
-
-        while at_war:
-
-            if player_one_cards[-1].value > player_two_cards[-1].value:
-
-                # Player One gets the cards
-                player_one.add_cards(player_one_cards)
-                player_one.add_cards(player_two_cards)
-
-                # No Longer at "war" , time for next round
-                at_war = False
-
-            # Player Two Has higher Card
-            elif player_one_cards[-1].value < player_two_cards[-1].value:
-
-                # Player Two gets the cards
-                player_two.add_cards(player_one_cards)
-                player_two.add_cards(player_two_cards)
-
-                # No Longer at "war" , time for next round
-                at_war = False
-
-            else:
-                print("WAR!")
-                # This occurs when the cards are equal.
-                # We'll grab another card each and continue the current war.
-                # First check to see if player has enough cards
-                # Check to see if a player is out of cards:
-                if len(player_one.all_cards) < 5:
-                    print("Player One unable to play war! Game Over at War")
-                    print("Player Two Wins! Player One Loses!")
-                    game_on = False
-                    break
-
-                elif len(player_two.all_cards) < 5:
-                    print("Player Two unable to play war! Game Over at War")
-                    print("Player One Wins! Player One Loses!")
-                    game_on = False
-                    break
-                # Otherwise, we're still at war, so we'll add the next cards
-                else:
-                    for num in range(5):
-                        player_one_cards.append(player_one.remove_one())
-                        player_two_cards.append(player_two.remove_one())
+        if not play_round(player_one, player_two, round_lines):
+            game_on = False
+            break
+
+    if round_lines:
+        output.write_frame(round_lines)
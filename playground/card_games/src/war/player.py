@@ -2,8 +2,11 @@
 1. a Player should be able to hold instances of Cards,
 2. He should also be able to remove and add them from their hand.
 3. Should be flexible enough to add one card, or many cards, so we'll use a simple if check to keep it all in the same method.
+4. Keeps a hash of the hand up to date, so repeated game states are found in O(1).
 """
 
+from .state_hash import HandHash
+
 
 class Player:
 
@@ -11,18 +14,24 @@ class Player:
         self.name = name
         # A new player has no cards
         self.all_cards = []
+        self.hand_hash = HandHash()
 
     def remove_one(self):
         # Note we remove one card from the list of all_cards
         # We state 0 to remove from the "top" of the deck
         # We'll imagine index -1 as the bottom of the deck
-        return self.all_cards.pop(0)
+        card = self.all_cards.pop(0)
+        self.hand_hash.remove_top(card.value)
+        return card
 
     def add_cards(self, new_cards):
         if type(new_cards) == type([]):
             self.all_cards.extend(new_cards)
+            for card in new_cards:
+                self.hand_hash.add_bottom(card.value)
         else:
             self.all_cards.append(new_cards)
+            self.hand_hash.add_bottom(new_cards.value)
 
     def __str__(self):
         return f"Player {self.name} has {len(self.all_cards)} cards."
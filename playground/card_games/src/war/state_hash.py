@@ -0,0 +1,56 @@
+from ..common.rng import RandomStream
+from .war_card import WarGameCard
+
+"""
+Zobrist-style incremental hashing of War hands.
+
+The future of a War game only depends on the card values in both hands, in
+order, so a repeated (hand one, hand two) state means the game loops forever.
+Every card value gets a random 64-bit key and a hand hashes to
+
+    sum(key[value of card i] * MULTIPLIER ** i) mod 2**64
+
+with i the position from the top. Taking the top card subtracts its key and
+multiplies by the inverse of MULTIPLIER; adding a card at the bottom adds its
+key times MULTIPLIER ** len(hand). Both are O(1) per card.
+"""
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+# Odd, so it has an inverse modulo 2**64
+MULTIPLIER = 0x9E3779B97F4A7C15
+MULTIPLIER_INVERSE = pow(MULTIPLIER, -1, 1 << HASH_BITS)
+# Mixes the second hand in, so swapping both hands gives another state
+SECOND_HAND_MIX = 0xC2B2AE3D27D4EB4F
+
+_keys_stream = RandomStream(0x5741520A, ("war_state_hash",))
+VALUE_KEYS = {
+    value: _keys_stream.getrandbits(HASH_BITS)
+    for value in sorted(set(WarGameCard.card_values.values()))
+}
+# MULTIPLIER ** i for every position a 52-card game can reach
+POWERS = [pow(MULTIPLIER, position, 1 << HASH_BITS) for position in range(2 * 52 + 1)]
+
+
+def combine_hands(first_hash: int, second_hash: int) -> int:
+    return first_hash ^ ((second_hash * SECOND_HAND_MIX) & HASH_MASK)
+
+
+class HandHash:
+    """Hash of one hand, kept up to date as cards are taken and added"""
+
+    def __init__(self):
+        self.value = 0
+        self.size = 0
+
+    def remove_top(self, card_value: int) -> None:
+        self.value = (
+            (self.value - VALUE_KEYS[card_value]) * MULTIPLIER_INVERSE
+        ) & HASH_MASK
+        self.size -= 1
+
+    def add_bottom(self, card_value: int) -> None:
+        self.value = (
+            self.value + VALUE_KEYS[card_value] * POWERS[self.size]
+        ) & HASH_MASK
+        self.size += 1
@@ -0,0 +1,70 @@
+from input_user import BoxOccupiedError
+from tricky_algorithm import WIN_TABLE
+
+"""
+Bitboard representation of the tricky board: one 9-bit integer per player,
+where box N (1-9) is stored in bit N-1.
+"""
+
+BOARD_BOXES = 9
+FULL_BOARD = (1 << BOARD_BOXES) - 1
+
+# Boxes set in every possible 9-bit mask, so list views are lookups as well
+BOXES_OF_MASK = tuple(
+    tuple(box for box in range(1, BOARD_BOXES + 1) if mask & (1 << (box - 1)))
+    for mask in range(1 << BOARD_BOXES)
+)
+
+
+class TrickyBitBoard:
+    __slots__ = ("_sides",)
+
+    def __init__(self, first_side: int = 0, second_side: int = 0):
+        self._sides = [first_side, second_side]
+
+    def mark(self, side: int, box: int) -> None:
+        bit = 1 << (box - 1)
+        if (self._sides[0] | self._sides[1]) & bit:
+            raise BoxOccupiedError(f"Box {box} is already occupied")
+        self._sides[side] |= bit
+
+    def unmark(self, side: int, box: int) -> None:
+        self._sides[side] &= ~(1 << (box - 1))
+
+    def side_mask(self, side: int) -> int:
+        return self._sides[side]
+
+    def has_won(self, side: int) -> bool:
+        return WIN_TABLE[self._sides[side]]
+
+    def is_free(self, box: int) -> bool:
+        return not (self._sides[0] | self._sides[1]) & (1 << (box - 1))
+
+    def copy(self) -> "TrickyBitBoard":
+        return TrickyBitBoard(self._sides[0], self._sides[1])
+
+    @property
+    def occupied_mask(self) -> int:
+        return self._sides[0] | self._sides[1]
+
+    @property
+    def occupied_boxes(self) -> tuple:
+        return BOXES_OF_MASK[self._sides[0] | self._sides[1]]
+
+    @property
+    def free_boxes(self) -> tuple:
+        return BOXES_OF_MASK[FULL_BOARD ^ (self._sides[0] | self._sides[1])]
+
+    @property
+    def is_full(self) -> bool:
+        return self._sides[0] | self._sides[1] == FULL_BOARD
+
+    @property
+    def is_draw(self) -> bool:
+        return self.is_full and not (
+            WIN_TABLE[self._sides[0]] or WIN_TABLE[self._sides[1]]
+        )
+
+    @property
+    def key(self) -> tuple:
+        return (self._sides[0], self._sides[1])
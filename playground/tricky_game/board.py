@@ -1,16 +1,45 @@
+from math import isqrt
+
+from output import get_output
+
+
 def display_board(board):
-    print("   |   | ")
-    print(" {} | {} | {}".format(board[0], board[1], board[2]))
-    print("   |   |")
-    print("-----------")
-    print("   |   | ")
-    print(" {} | {} | {}".format(board[3], board[4], board[5]))
-    print("   |   |")
-    print("-----------")
-    print("   |   |")
-    print(" {} | {} | {}".format(board[6], board[7], board[8]))
-    print("   |   |")
+    """Renders the board as one frame of the current output sink"""
+    output = get_output()
+    if not output.renders:
+        return
+    size = isqrt(len(board))
+    if size != 3:
+        output.write_frame(grid_board_lines(board, size))
+        return
+    output.write_frame(
+        (
+            "   |   | ",
+            " {} | {} | {}".format(board[0], board[1], board[2]),
+            "   |   |",
+            "-----------",
+            "   |   | ",
+            " {} | {} | {}".format(board[3], board[4], board[5]),
+            "   |   |",
+            "-----------",
+            "   |   |",
+            " {} | {} | {}".format(board[6], board[7], board[8]),
+            "   |   |",
+        )
+    )
+
+
+def grid_board_lines(board, size):
+    cell_width = len(str(len(board)))
+    separator = "-" * ((cell_width + 3) * size - 1)
+    lines = []
+    for row in range(size):
+        cells = board[row * size : (row + 1) * size]
+        lines.append(" " + " | ".join(str(cell).rjust(cell_width) for cell in cells))
+        if row < size - 1:
+            lines.append(separator)
+    return lines
 
 
-def get_init_board():
-    return list(range(1, 10))
+def get_init_board(size=3):
+    return list(range(1, size * size + 1))
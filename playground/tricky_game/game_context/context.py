@@ -1,3 +1,9 @@
+from time import perf_counter
+
+from bitboard import TrickyBitBoard
+from output import get_output
+
+
 class TrickyGameContext:
     """
     The Context defines the interface of interest to clients. It also maintains
@@ -13,11 +19,29 @@ class TrickyGameContext:
     A reference to the current state of the Context.
     """
 
-    def __init__(self, player1, player2, init_board, tricky_winner_algorithm):
+    def __init__(
+        self,
+        player1,
+        player2,
+        init_board,
+        tricky_winner_algorithm=None,
+        verbose=True,
+        board_state=None,
+        hooks=None,
+    ):
         self._player1 = player1
         self._player2 = player2
         self._current_board = init_board
+        # Custom list-based rule; when None the bitboard win table is used
         self._tricky_winner_algorithm = tricky_winner_algorithm
+        # Any board with the TrickyBitBoard interface, e.g. a GridBoard
+        self._bitboard = board_state if board_state is not None else TrickyBitBoard()
+        # Headless games (simulations) run without printing anything
+        self._verbose = verbose
+        # Optional instrumentation.EventHooks, the clock is only read with hooks
+        self._hooks = hooks
+        self._started_at = perf_counter() if hooks is not None else None
+        self._turns = 0
         self.transition_to_state(self._player1)
 
     def transition_to_state(self, player_state):
@@ -25,9 +49,11 @@ class TrickyGameContext:
         The Context allows changing the State object at runtime.
         """
 
-        print(f"Context: Transition to {player_state.name}")
+        if self._verbose:
+            get_output().write_line(f"Context: Transition to {player_state.name}")
         self._player_state = player_state
         self._player_state.context = self
+        self._current_side = 0 if player_state is self._player1 else 1
 
     """
     The Context delegates part of its behavior to the current State object.
@@ -35,30 +61,77 @@ class TrickyGameContext:
 
     def play_turn(self):
         if self._is_game_active:
+            hooks = self._hooks
+            self._turns += 1
+            if hooks is not None:
+                turn_started_at = perf_counter()
+                hooks.emit("turn_started", player=self._player_state.name)
             movement = self._player_state.play_turn(self.get_game_occupied_boxes)
+            if hooks is not None:
+                hooks.emit(
+                    "decision",
+                    player=self._player_state.name,
+                    box=movement,
+                    duration=perf_counter() - turn_started_at,
+                )
+            self._bitboard.mark(self._current_side, movement)
             self._current_board[movement - 1] = self._player_state.label
-            if self.__check_winner_exists():
-                return
-            if self.__verify_game_draw_and_finished():
-                return
-            self._player_state.next_turn()
+            game_over = (
+                self.__check_winner_exists() or self.__verify_game_draw_and_finished()
+            )
+            if hooks is not None:
+                self.__emit_turn_finished(turn_started_at, game_over)
+            if not game_over:
+                self._player_state.next_turn()
+
+    def __emit_turn_finished(self, turn_started_at: float, game_over: bool) -> None:
+        finished_at = perf_counter()
+        self._hooks.emit(
+            "turn",
+            player=self._player_state.name,
+            duration=finished_at - turn_started_at,
+        )
+        if not game_over:
+            return
+        if self._player_state.is_winner:
+            self._hooks.emit(
+                "winner", player=self._player_state.name, turns=self._turns
+            )
+        else:
+            self._hooks.emit("tie", turns=self._turns)
+        self._hooks.emit(
+            "match", turns=self._turns, duration=finished_at - self._started_at
+        )
 
     def __check_winner_exists(self) -> bool:
-        player_turn_result = self._tricky_winner_algorithm(self._player_state.movements)
+        if self._tricky_winner_algorithm is None:
+            player_turn_result = self._bitboard.has_won(self._current_side)
+        else:
+            player_turn_result = self._tricky_winner_algorithm(
+                self._player_state.movements
+            )
         if player_turn_result:
             self._is_game_active = False
             self._player_state.is_winner = True
         return player_turn_result
 
     def __verify_game_draw_and_finished(self) -> bool:
-        if len(self.get_game_occupied_boxes) == 9:
+        if self._bitboard.is_full:
             self._is_game_active = False
             return True
         return False
 
     @property
     def get_game_occupied_boxes(self):
-        return self._player1.movements + self._player2.movements
+        return self._bitboard.occupied_boxes
+
+    @property
+    def bitboard(self):
+        return self._bitboard
+
+    @property
+    def current_side(self):
+        return self._current_side
 
     @property
     def get_live_board(self):
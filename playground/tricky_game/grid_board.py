@@ -0,0 +1,133 @@
+from input_user import BoxOccupiedError
+
+"""
+N x N board where a player wins with k marks in a row (e.g. 15x15 and 5 in a
+row for gomoku). It exposes the same interface as TrickyBitBoard so it can be
+handed to TrickyGameContext, but the winner is found incrementally: marking a
+box only walks the four lines through it, O(k) instead of rescanning the board.
+"""
+
+# (row, column) steps of the four line directions through a box
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class GridBoard:
+    def __init__(self, size: int = 15, in_a_row: int = 5):
+        if in_a_row > size:
+            raise ValueError("in_a_row can't be bigger than the board size")
+        self.size = size
+        self.in_a_row = in_a_row
+        self.cells = size * size
+        # 0 empty, 1 first side, 2 second side - indexed by box - 1
+        self._cell_owner = bytearray(self.cells)
+        self._sides = [0, 0]
+        self._occupied = set()
+        # Free boxes with their positions, so a mark removes one in O(1)
+        self._free = list(range(1, self.cells + 1))
+        self._free_position = {box: box - 1 for box in self._free}
+        self._winner = None
+        self._winning_move = None
+        self.last_move = None
+
+    def mark(self, side: int, box: int) -> None:
+        if box in self._occupied:
+            raise BoxOccupiedError(f"Box {box} is already occupied")
+        if not 1 <= box <= self.cells:
+            raise ValueError(f"Box must be a number between 1 and {self.cells}")
+        self._cell_owner[box - 1] = side + 1
+        self._sides[side] |= 1 << (box - 1)
+        self._occupied.add(box)
+        self.__remove_free(box)
+        self.last_move = box
+        if self._winner is None and self.__completes_line(side, box):
+            self._winner = side
+            self._winning_move = box
+
+    def unmark(self, side: int, box: int) -> None:
+        # A free box would be added to the free list twice
+        if not 1 <= box <= self.cells or self._cell_owner[box - 1] != side + 1:
+            raise ValueError(f"Box {box} isn't marked by side {side}")
+        self._cell_owner[box - 1] = 0
+        self._sides[side] &= ~(1 << (box - 1))
+        self._occupied.discard(box)
+        self._free_position[box] = len(self._free)
+        self._free.append(box)
+        if box == self._winning_move:
+            self._winner = None
+            self._winning_move = None
+
+    def __remove_free(self, box: int) -> None:
+        position = self._free_position.pop(box)
+        last_box = self._free.pop()
+        if last_box != box:
+            self._free[position] = last_box
+            self._free_position[last_box] = position
+
+    def __completes_line(self, side: int, box: int) -> bool:
+        owner = side + 1
+        row, column = divmod(box - 1, self.size)
+        for row_step, column_step in LINE_DIRECTIONS:
+            in_line = 1
+            for direction in (1, -1):
+                r = row + row_step * direction
+                c = column + column_step * direction
+                while (
+                    0 <= r < self.size
+                    and 0 <= c < self.size
+                    and self._cell_owner[r * self.size + c] == owner
+                ):
+                    in_line += 1
+                    if in_line >= self.in_a_row:
+                        return True
+                    r += row_step * direction
+                    c += column_step * direction
+        return False
+
+    def side_mask(self, side: int) -> int:
+        return self._sides[side]
+
+    def has_won(self, side: int) -> bool:
+        return self._winner == side
+
+    def is_free(self, box: int) -> bool:
+        return box not in self._occupied
+
+    def copy(self) -> "GridBoard":
+        board = GridBoard.__new__(GridBoard)
+        board.size = self.size
+        board.in_a_row = self.in_a_row
+        board.cells = self.cells
+        board._cell_owner = bytearray(self._cell_owner)
+        board._sides = list(self._sides)
+        board._occupied = set(self._occupied)
+        board._free = list(self._free)
+        board._free_position = dict(self._free_position)
+        board._winner = self._winner
+        board._winning_move = self._winning_move
+        board.last_move = self.last_move
+        return board
+
+    @property
+    def occupied_mask(self) -> int:
+        return self._sides[0] | self._sides[1]
+
+    @property
+    def occupied_boxes(self) -> set:
+        return self._occupied
+
+    @property
+    def free_boxes(self) -> list:
+        """Free boxes in no particular order; read-only, it is not a copy"""
+        return self._free
+
+    @property
+    def is_full(self) -> bool:
+        return not self._free
+
+    @property
+    def is_draw(self) -> bool:
+        return not self._free and self._winner is None
+
+    @property
+    def key(self) -> tuple:
+        return (self._sides[0], self._sides[1])
@@ -0,0 +1,24 @@
+from game_context.player_state import PlayerState
+from move_providers import MoveProvider
+
+
+class HeadlessPlayer(PlayerState):
+    """Player whose moves come from a MoveProvider instead of the terminal"""
+
+    def __init__(self, number, label, move_provider: MoveProvider, name=None):
+        self.number = number
+        self.label = label
+        self.name = name if name is not None else f"Player {number}"
+        self.move_provider = move_provider
+        self.is_winner = False
+        self._movements = []
+
+    @property
+    def movements(self):
+        return self._movements
+
+    def play_turn(self, board_status):
+        movement = self.move_provider.choose_move(self.context)
+        self._movements.append(movement)
+
+        return movement
@@ -0,0 +1,142 @@
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+Structured events of a game context and the metrics built on them.
+
+A context takes an optional EventHooks; without one it doesn't even read the
+clock, so uninstrumented games pay a single `is None` check per event site.
+Subscribers receive (event, fields). Metrics subscribes to every event ("*"):
+it counts events and keeps a latency histogram of every event carrying a
+`duration` field (seconds), and can be dumped as JSON or served over HTTP.
+
+card_games has the same module in src/common; the games run as separate
+programs from their own folders, so each keeps its copy, change both.
+"""
+
+ALL_EVENTS = "*"
+
+# Histogram bucket upper bounds: 1 microsecond doubling up to ~2 minutes
+BUCKET_BOUNDS = [1e-6 * 2**exponent for exponent in range(28)]
+
+
+class EventHooks:
+    def __init__(self):
+        self.__subscribers: dict[str, list] = {}
+
+    def subscribe(self, event: str, callback) -> None:
+        """callback(event, fields) for every `event`, or every event with "*" """
+        self.__subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event: str, callback) -> None:
+        self.__subscribers[event].remove(callback)
+
+    def emit(self, event: str, **fields) -> None:
+        for callback in self.__subscribers.get(event, ()):
+            callback(event, fields)
+        for callback in self.__subscribers.get(ALL_EVENTS, ()):
+            callback(event, fields)
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.buckets[bisect_left(BUCKET_BOUNDS, value)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the fraction-th value"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(BUCKET_BOUNDS):
+                    return self.maximum
+                return min(BUCKET_BOUNDS[index], self.maximum)
+        return self.maximum
+
+    def to_json(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+        }
+
+
+class Metrics:
+    """Event counters and duration histograms, fed by one or more EventHooks"""
+
+    def __init__(self, hooks: EventHooks = None):
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.__lock = threading.Lock()
+        if hooks is not None:
+            self.attach(hooks)
+
+    def attach(self, hooks: EventHooks) -> None:
+        hooks.subscribe(ALL_EVENTS, self.on_event)
+
+    def on_event(self, event: str, fields: dict) -> None:
+        with self.__lock:
+            self.counters[event] = self.counters.get(event, 0) + 1
+            duration = fields.get("duration")
+            if duration is not None:
+                histogram = self.histograms.get(event)
+                if histogram is None:
+                    histogram = self.histograms[event] = Histogram()
+                histogram.record(duration)
+
+    def to_json(self) -> dict:
+        with self.__lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    event: histogram.to_json()
+                    for event, histogram in self.histograms.items()
+                },
+            }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as metrics_file:
+            json.dump(self.to_json(), metrics_file, indent=2)
+
+    def serve(self, host="127.0.0.1", port=9100) -> ThreadingHTTPServer:
+        """Serves GET /metrics as JSON from a daemon thread; shutdown() to stop"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.to_json()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import random
+import time
+
+from server import DEFAULT_PORT
+
+"""
+Load generator for server.py: opens many concurrent connections that play
+random legal moves against the server AI, then reports sessions/second and
+the move latency (MOVE sent until the server answers) percentiles.
+"""
+
+
+async def play_sessions(host, port, games, rng: random.Random, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    finished = 0
+    try:
+        writer.write(b"PLAY AI\n")
+        move_sent_at = None
+        while finished < games:
+            line = await reader.readline()
+            if not line:
+                break
+            message = line.decode().split()
+            if move_sent_at is not None:
+                latencies.append(time.perf_counter() - move_sent_at)
+                move_sent_at = None
+            if message[0] == "TURN":
+                free = [box for box, cell in enumerate(message[1], 1) if cell == "."]
+                writer.write(f"MOVE {rng.choice(free)}\n".encode())
+                move_sent_at = time.perf_counter()
+            elif message[0] == "END":
+                finished += 1
+                if finished < games:
+                    writer.write(b"PLAY AI\n")
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return finished
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host, port, clients, games_per_client, seed):
+    rng = random.Random(seed)
+    latencies = []
+    started = time.perf_counter()
+    finished = await asyncio.gather(
+        *(
+            play_sessions(
+                host, port, games_per_client, random.Random(rng.random()), latencies
+            )
+            for _ in range(clients)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    sessions = sum(finished)
+    print(f"{sessions} sessions in {elapsed:.2f}s: {sessions / elapsed:.0f} sessions/s")
+    if latencies:
+        print(
+            f"move latency p50 {percentile(latencies, 0.5) * 1000:.2f}ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--games", type=int, default=10, help="games per client")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    asyncio.run(
+        run_load(
+            arguments.host,
+            arguments.port,
+            arguments.clients,
+            arguments.games,
+            arguments.seed,
+        )
+    )
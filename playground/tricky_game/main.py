@@ -1,7 +1,7 @@
 from board import get_init_board, display_board
 from player import Player
 from game_context.context import TrickyGameContext
-from tricky_algorithm import verify_tricky_winner
+from output import get_output
 
 
 def init_game():
@@ -10,12 +10,12 @@ def init_game():
     player1.setNameWithInput()
     player2.setNameWithInput()
 
-    print(
+    get_output().write_line(
         "Welcome to the Tricky game. Player 1: {player1}, & Player 2: {player2} will face each other.".format(
             player1=player1.name, player2=player2.name
         )
     )
-    print(
+    get_output().write_line(
         """To play you will use the board below as a reference. At each turn you will be asked for your move,
 and you must put a number from 1 to 9, where the number represents the box you want to mark.
 Note: As the game progresses some boxes will already be occupied, and you only will be able to select the empty ones."""
@@ -29,12 +29,12 @@ Note: As the game progresses some boxes will already be occupied, and you only w
 def play_game(player1, player2, init_board):
     player1.set_next_player(player2)
     player2.set_next_player(player1)
-    game_context = TrickyGameContext(player1, player2, init_board, verify_tricky_winner)
+    game_context = TrickyGameContext(player1, player2, init_board)
     while game_context.is_game_active:
         game_context.play_turn()
         display_board(game_context.get_live_board)
 
-    print(game_context.get_game_result)
+    get_output().write_line(game_context.get_game_result)
     play_again = input("Are you ready to play? Enter Yes or No.").lower()[0] == "y"
 
     if play_again:
@@ -0,0 +1,202 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from headless_player import HeadlessPlayer
+from move_providers import MoveProvider
+
+"""
+Monte Carlo Tree Search player for boards too big to solve (e.g. a 15x15
+GridBoard). The search is root-parallel: every worker process grows its own
+tree from the current position for the time budget, then the visit counts of
+the root moves are merged and the most visited move is played.
+
+It only relies on the board interface shared by TrickyBitBoard and GridBoard
+(copy, mark, has_won, is_full, free_boxes), so it works on any of them.
+"""
+
+
+class _Node:
+    __slots__ = (
+        "move",
+        "parent",
+        "side",
+        "children",
+        "untried_moves",
+        "visits",
+        "wins",
+    )
+
+    def __init__(self, move, parent, side, untried_moves):
+        self.move = move
+        self.parent = parent
+        # Side that played `move` to reach this node
+        self.side = side
+        self.children = []
+        self.untried_moves = untried_moves
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> "_Node":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+def _rollout(board, side, rng: random.Random):
+    """Random playout with `side` to move. Returns the winner side or None"""
+    while not board.is_full:
+        board.mark(side, rng.choice(board.free_boxes))
+        if board.has_won(side):
+            return side
+        side = 1 - side
+    return None
+
+
+def find_forced_move(board_state, side):
+    """A move that wins right away, else one that blocks an immediate loss"""
+    board = board_state.copy()
+    for player in (side, 1 - side):
+        for move in list(board.free_boxes):
+            board.mark(player, move)
+            won = board.has_won(player)
+            board.unmark(player, move)
+            if won:
+                return move
+    return None
+
+
+def search_root(board_state, side, time_budget, max_iterations, seed, exploration):
+    """
+    Grow one MCTS tree from board_state with `side` to move.
+    Returns ({move: (visits, wins)}, iterations). Module level so worker
+    processes can run it.
+    """
+    rng = random.Random(seed)
+    root = _Node(None, None, 1 - side, list(board_state.free_boxes))
+    deadline = time.perf_counter() + time_budget
+    iterations = 0
+    while iterations < max_iterations and time.perf_counter() < deadline:
+        iterations += 1
+        board = board_state.copy()
+        node = root
+        while not node.untried_moves and node.children:
+            node = node.select_child(exploration)
+            board.mark(node.side, node.move)
+
+        winner = None
+        if board.has_won(node.side):
+            winner = node.side
+        elif node.untried_moves:
+            moves = node.untried_moves
+            index = rng.randrange(len(moves))
+            moves[index], moves[-1] = moves[-1], moves[index]
+            move = moves.pop()
+            mover = 1 - node.side
+            board.mark(mover, move)
+            finished = board.has_won(mover) or board.is_full
+            child = _Node(move, node, mover, [] if finished else list(board.free_boxes))
+            node.children.append(child)
+            node = child
+            if board.has_won(mover):
+                winner = mover
+            elif not finished:
+                winner = _rollout(board, 1 - mover, rng)
+
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.side:
+                node.wins += 1
+            node = node.parent
+
+    stats = {child.move: (child.visits, child.wins) for child in root.children}
+    return stats, iterations
+
+
+class MctsMoveProvider(MoveProvider):
+    """
+    time_budget is the wall time (seconds) each worker searches per move;
+    max_iterations caps the iterations per worker, e.g. for repeatable runs.
+    With workers=1 the search runs in-process, otherwise the process pool is
+    created on first use and kept until close().
+    """
+
+    def __init__(
+        self,
+        time_budget: float = 0.5,
+        workers: int = None,
+        exploration: float = math.sqrt(2),
+        max_iterations: int = None,
+        rng: random.Random = None,
+    ):
+        self.time_budget = time_budget
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.exploration = exploration
+        self.max_iterations = max_iterations if max_iterations is not None else math.inf
+        self._rng = rng if rng is not None else random.Random()
+        self._executor = None
+        self.last_iterations = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def choose_move(self, context) -> int:
+        return self.search(context.bitboard, context.current_side)
+
+    def search(self, board_state, side) -> int:
+        forced_move = find_forced_move(board_state, side)
+        if forced_move is not None:
+            self.last_iterations = 0
+            return forced_move
+        arguments = [
+            (
+                board_state,
+                side,
+                self.time_budget,
+                self.max_iterations,
+                self._rng.getrandbits(64),
+                self.exploration,
+            )
+            for _ in range(self.workers)
+        ]
+        if self.workers == 1:
+            results = [search_root(*arguments[0])]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            results = list(self._executor.map(search_root, *zip(*arguments)))
+
+        visits = {}
+        self.last_iterations = 0
+        for stats, iterations in results:
+            self.last_iterations += iterations
+            for move, (move_visits, _) in stats.items():
+                visits[move] = visits.get(move, 0) + move_visits
+        return max(visits, key=visits.get)
+
+
+class MctsPlayer(HeadlessPlayer):
+    """AI player state backed by MctsMoveProvider; call close() when done"""
+
+    def __init__(self, number, label, name="MCTS", move_provider=None):
+        if move_provider is None:
+            move_provider = MctsMoveProvider()
+        super().__init__(number, label, move_provider, name)
+
+    def close(self) -> None:
+        self.move_provider.close()
@@ -0,0 +1,149 @@
+import random
+
+from bitboard import BOARD_BOXES, BOXES_OF_MASK, FULL_BOARD
+from headless_player import HeadlessPlayer
+from move_providers import MoveProvider
+from tricky_algorithm import WIN_TABLE
+
+"""
+Perfect-play tricky player: negamax with alpha-beta pruning over the two
+bitboards, caching every solved position in a transposition table keyed on
+its canonical form under the eight rotations/reflections of the board.
+"""
+
+_EXACT, _LOWER_BOUND, _UPPER_BOUND = 0, 1, 2
+
+
+def _board_symmetries():
+    """The 8 permutations of the box bits (4 rotations, each one mirrored)"""
+    cells = [(row, col) for row in range(3) for col in range(3)]
+    rotate = [cells.index((col, 2 - row)) for row, col in cells]
+    mirror = [cells.index((row, 2 - col)) for row, col in cells]
+    permutations = []
+    permutation = list(range(BOARD_BOXES))
+    for _ in range(4):
+        permutations.append(permutation)
+        permutations.append([mirror[bit] for bit in permutation])
+        permutation = [rotate[bit] for bit in permutation]
+    return permutations
+
+
+def _mask_table(permutation):
+    table = []
+    for mask in range(1 << BOARD_BOXES):
+        moved = 0
+        for bit in range(BOARD_BOXES):
+            if mask & (1 << bit):
+                moved |= 1 << permutation[bit]
+        table.append(moved)
+    return tuple(table)
+
+
+SYMMETRY_TABLES = tuple(_mask_table(p) for p in _board_symmetries())
+
+
+def canonical_key(own: int, opponent: int) -> int:
+    """Smallest encoding of the position among its 8 symmetric variants"""
+    return min(
+        (table[own] << BOARD_BOXES) | table[opponent] for table in SYMMETRY_TABLES
+    )
+
+
+class MinimaxMoveProvider(MoveProvider):
+    """
+    Scores are from the side to move: 0 is a draw and a win is worth the
+    number of boxes left when it happens, so faster wins score higher.
+    The transposition table and the best moves of every position already
+    asked for are kept across games, so warm positions answer with a lookup.
+    """
+
+    def __init__(self, rng: random.Random = None):
+        self._rng = rng
+        self._table = {}
+        self._best_moves = {}
+
+    @property
+    def table_size(self) -> int:
+        return len(self._table)
+
+    def choose_move(self, context) -> int:
+        bitboard = context.bitboard
+        side = context.current_side
+        return self.best_move(bitboard.side_mask(side), bitboard.side_mask(1 - side))
+
+    def best_move(self, own: int, opponent: int) -> int:
+        position = (own << BOARD_BOXES) | opponent
+        best_moves = self._best_moves.get(position)
+        if best_moves is None:
+            scores = self.score_moves(own, opponent)
+            best_score = max(scores.values())
+            best_moves = tuple(
+                box for box, score in scores.items() if score == best_score
+            )
+            self._best_moves[position] = best_moves
+        if self._rng is None:
+            return best_moves[0]
+        return self._rng.choice(best_moves)
+
+    def score_moves(self, own: int, opponent: int) -> dict:
+        free = FULL_BOARD ^ (own | opponent)
+        scores = {}
+        for box in BOXES_OF_MASK[free]:
+            played = own | (1 << (box - 1))
+            if WIN_TABLE[played]:
+                scores[box] = len(BOXES_OF_MASK[free])
+            else:
+                scores[box] = -self.negamax(opponent, played)
+        return scores
+
+    def negamax(self, own: int, opponent: int, alpha: int = -10, beta: int = 10) -> int:
+        key = canonical_key(own, opponent)
+        entry = self._table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        free = FULL_BOARD ^ (own | opponent)
+        if not free:
+            return 0
+
+        original_alpha = alpha
+        best = -10
+        boxes = BOXES_OF_MASK[free]
+        for box in boxes:
+            played = own | (1 << (box - 1))
+            if WIN_TABLE[played]:
+                value = len(boxes)
+            else:
+                value = -self.negamax(opponent, played, -beta, -alpha)
+            if value > best:
+                best = value
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = _UPPER_BOUND
+        elif best >= beta:
+            flag = _LOWER_BOUND
+        else:
+            flag = _EXACT
+        self._table[key] = (best, flag)
+        return best
+
+
+class MinimaxPlayer(HeadlessPlayer):
+    """AI player state that never loses; plugs into TrickyGameContext as-is"""
+
+    def __init__(self, number, label, name="Minimax", move_provider=None):
+        if move_provider is None:
+            move_provider = MinimaxMoveProvider()
+        super().__init__(number, label, move_provider, name)
@@ -0,0 +1,43 @@
+import random
+from abc import ABC, abstractmethod
+
+"""
+Move providers decide the next box of a headless player. They only look at
+the context (board and side to move), so the same provider can be shared by
+many games - e.g. to keep a search cache warm during a simulation.
+"""
+
+
+class MoveProvider(ABC):
+
+    @abstractmethod
+    def choose_move(self, context) -> int:
+        pass
+
+    def new_game(self) -> None:
+        """Hook called before every game; stateless providers ignore it"""
+
+
+class RandomMoveProvider(MoveProvider):
+
+    def __init__(self, rng: random.Random = None):
+        self._rng = rng if rng is not None else random.Random()
+
+    def choose_move(self, context) -> int:
+        return self._rng.choice(context.bitboard.free_boxes)
+
+
+class ScriptedMoveProvider(MoveProvider):
+    """Replays a fixed list of boxes, restarting from the first one each game"""
+
+    def __init__(self, moves):
+        self._moves = list(moves)
+        self._next_move = 0
+
+    def new_game(self) -> None:
+        self._next_move = 0
+
+    def choose_move(self, context) -> int:
+        move = self._moves[self._next_move]
+        self._next_move += 1
+        return move
@@ -0,0 +1,202 @@
+import mmap
+import os
+import sys
+
+from bitboard import BOARD_BOXES, BOXES_OF_MASK, FULL_BOARD
+from minimax_player import MinimaxMoveProvider
+from move_providers import MoveProvider
+from tricky_algorithm import WIN_TABLE, verify_tricky_winner
+
+"""
+Opening book / position database for the tricky game.
+
+Every board is encoded in base 3 (0 empty, 1 first player, 2 second player,
+box N being the digit 3^(N-1)), which gives 3^9 = 19683 slots. The file is a
+small header followed by two bytes per slot:
+
+- byte 0: best move (1-9), TERMINAL for finished games, UNREACHABLE otherwise
+- byte 1: game value for the side to move as a signed byte; a win is worth
+  the boxes left when it happens, so faster wins score higher (see minimax)
+
+Loading the book is an mmap plus a header check, and a query is one lookup.
+
+Usage:
+    python opening_book.py build [path]
+    python opening_book.py verify [path]
+"""
+
+BOOK_MAGIC = b"TRKBOOK1"
+BOOK_POSITIONS = 3**BOARD_BOXES
+ENTRY_SIZE = 2
+TERMINAL = 0
+UNREACHABLE = 0xFF
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), "tricky_opening_book.bin")
+
+# Base-3 weight of every 9-bit mask, so encoding two bitboards costs 2 lookups
+TERNARY_OF_MASK = tuple(
+    sum(3 ** (box - 1) for box in BOXES_OF_MASK[mask])
+    for mask in range(1 << BOARD_BOXES)
+)
+
+
+class OpeningBookError(Exception):
+    "Raise exception when a book file is invalid or does not match the rules"
+
+
+def encode_masks(first_mask: int, second_mask: int) -> int:
+    return TERNARY_OF_MASK[first_mask] + 2 * TERNARY_OF_MASK[second_mask]
+
+
+def encode_board(board, first_label="X", second_label="O") -> int:
+    """Encode a live board (list of box numbers and player labels)"""
+    first_mask = second_mask = 0
+    for index, box in enumerate(board):
+        if box == first_label:
+            first_mask |= 1 << index
+        elif box == second_label:
+            second_mask |= 1 << index
+    return encode_masks(first_mask, second_mask)
+
+
+def _reachable_positions():
+    """All (first_mask, second_mask) pairs reachable from the empty board"""
+    positions = {(0, 0)}
+    frontier = [(0, 0)]
+    while frontier:
+        first, second = frontier.pop()
+        if WIN_TABLE[first] or WIN_TABLE[second] or first | second == FULL_BOARD:
+            continue
+        first_to_move = len(BOXES_OF_MASK[first]) == len(BOXES_OF_MASK[second])
+        for box in BOXES_OF_MASK[FULL_BOARD ^ (first | second)]:
+            bit = 1 << (box - 1)
+            child = (first | bit, second) if first_to_move else (first, second | bit)
+            if child not in positions:
+                positions.add(child)
+                frontier.append(child)
+    return positions
+
+
+def build_book(path: str = DEFAULT_BOOK_PATH) -> int:
+    """Solve every reachable position and write the book. Returns positions"""
+    solver = MinimaxMoveProvider()
+    table = bytearray([UNREACHABLE, 0]) * BOOK_POSITIONS
+    positions = _reachable_positions()
+    for first, second in positions:
+        offset = encode_masks(first, second) * ENTRY_SIZE
+        if WIN_TABLE[first] or WIN_TABLE[second] or first | second == FULL_BOARD:
+            table[offset] = TERMINAL
+            table[offset + 1] = 0
+            continue
+        first_to_move = len(BOXES_OF_MASK[first]) == len(BOXES_OF_MASK[second])
+        own, opponent = (first, second) if first_to_move else (second, first)
+        scores = solver.score_moves(own, opponent)
+        best_score = max(scores.values())
+        table[offset] = min(box for box, score in scores.items() if score == best_score)
+        table[offset + 1] = best_score & 0xFF
+
+    with open(path, "wb") as book_file:
+        book_file.write(BOOK_MAGIC)
+        book_file.write(table)
+    return len(positions)
+
+
+class OpeningBook:
+    """Read-only view over a book file; usable as a context manager"""
+
+    def __init__(self, path: str = DEFAULT_BOOK_PATH):
+        with open(path, "rb") as book_file:
+            self._data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if (
+            self._data[: len(BOOK_MAGIC)] != BOOK_MAGIC
+            or len(self._data) != len(BOOK_MAGIC) + BOOK_POSITIONS * ENTRY_SIZE
+        ):
+            self._data.close()
+            raise OpeningBookError(f"{path} is not a tricky opening book")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def entry(self, position: int):
+        """(best move, value) of an encoded position, best move may be TERMINAL"""
+        offset = len(BOOK_MAGIC) + position * ENTRY_SIZE
+        move = self._data[offset]
+        if move == UNREACHABLE:
+            raise OpeningBookError(f"Position {position} is not reachable")
+        value = self._data[offset + 1]
+        return move, value - 256 if value > 127 else value
+
+    def best_move(self, board, first_label="X", second_label="O"):
+        """Best box for the side to move on a live board, None if game is over"""
+        move = self.entry(encode_board(board, first_label, second_label))[0]
+        return None if move == TERMINAL else move
+
+    def best_move_for_masks(self, first_mask: int, second_mask: int):
+        move = self.entry(encode_masks(first_mask, second_mask))[0]
+        return None if move == TERMINAL else move
+
+    def verify(self) -> int:
+        """
+        Check every reachable position against verify_tricky_winner and check
+        that playing the stored move keeps the stored value. Returns the
+        positions checked, raises OpeningBookError on the first mismatch.
+        """
+        positions = _reachable_positions()
+        for first, second in positions:
+            position = encode_masks(first, second)
+            move, value = self.entry(position)
+            first_moves = list(BOXES_OF_MASK[first])
+            second_moves = list(BOXES_OF_MASK[second])
+            finished = (
+                verify_tricky_winner(first_moves)
+                or verify_tricky_winner(second_moves)
+                or len(first_moves) + len(second_moves) == BOARD_BOXES
+            )
+            if finished != (move == TERMINAL):
+                raise OpeningBookError(f"Position {position} terminal flag is wrong")
+            if finished:
+                continue
+            if move not in BOXES_OF_MASK[FULL_BOARD ^ (first | second)]:
+                raise OpeningBookError(f"Position {position} stores illegal move")
+            first_to_move = len(first_moves) == len(second_moves)
+            mover_moves = first_moves if first_to_move else second_moves
+            if verify_tricky_winner(mover_moves + [move]):
+                expected = BOARD_BOXES - len(first_moves) - len(second_moves)
+            else:
+                bit = 1 << (move - 1)
+                child = (
+                    (first | bit, second) if first_to_move else (first, second | bit)
+                )
+                expected = -self.entry(encode_masks(*child))[1]
+            if value != expected:
+                raise OpeningBookError(f"Position {position} value is inconsistent")
+        return len(positions)
+
+
+class OpeningBookMoveProvider(MoveProvider):
+
+    def __init__(self, book: OpeningBook):
+        self._book = book
+
+    def choose_move(self, context) -> int:
+        bitboard = context.bitboard
+        return self._book.best_move_for_masks(
+            bitboard.side_mask(0), bitboard.side_mask(1)
+        )
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    book_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_BOOK_PATH
+    if command == "build":
+        print(f"{build_book(book_path)} positions written to {book_path}")
+    elif command == "verify":
+        with OpeningBook(book_path) as book:
+            print(f"{book.verify()} positions verified in {book_path}")
+    else:
+        print("Usage: python opening_book.py build|verify [path]")
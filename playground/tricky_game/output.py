@@ -0,0 +1,87 @@
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+
+"""
+Output sinks for game rendering. Renderers build a whole frame (a board, a
+hand, a round of messages) and hand it to the current sink in one call:
+
+- TerminalSink: one write + flush per frame, same text print() would show
+- NullSink: drops everything, for simulations and bulk games
+- JsonlSink: one JSON record per frame, a transcript of the game
+
+Renderers may skip building frames when `sink.renders` is False.
+
+card_games has the same module in src/common; the games run as separate
+programs from their own folders, so each keeps its copy, change both.
+"""
+
+
+class OutputSink(ABC):
+    renders = True
+
+    @abstractmethod
+    def write_frame(self, lines) -> None:
+        pass
+
+    def write_line(self, text: str) -> None:
+        self.write_frame((text,))
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NullSink(OutputSink):
+    renders = False
+
+    def write_frame(self, lines) -> None:
+        pass
+
+    def write_line(self, text: str) -> None:
+        pass
+
+
+class TerminalSink(OutputSink):
+    def __init__(self, stream=None):
+        # None follows sys.stdout, also when it gets redirected later
+        self.stream = stream
+
+    def write_frame(self, lines) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+
+class JsonlSink(OutputSink):
+    def __init__(self, path: str):
+        self.__file = open(path, "a")
+        self.__frames = 0
+
+    def write_frame(self, lines) -> None:
+        self.__frames += 1
+        record = {"frame": self.__frames, "time": time.time(), "lines": list(lines)}
+        self.__file.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+_output: OutputSink = TerminalSink()
+
+
+def get_output() -> OutputSink:
+    return _output
+
+
+def set_output(sink: OutputSink) -> OutputSink:
+    """Makes sink the output of every renderer, returns the previous one"""
+    global _output
+    previous, _output = _output, sink
+    return previous
@@ -32,7 +32,9 @@ class Player(PlayerState):
         self._movements.append(newMove)
 
     def play_turn(self, board_status):
-        movement = player_input(board_status, self.name)
+        movement = player_input(
+            board_status, self.name, len(self.context.get_live_board)
+        )
         self.addMovement(movement)
 
         return movement
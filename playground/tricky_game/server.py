@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import itertools
+
+from board import get_init_board
+from game_context.context import TrickyGameContext
+from headless_player import HeadlessPlayer
+from minimax_player import MinimaxMoveProvider
+from move_providers import MoveProvider
+
+"""
+asyncio TCP server hosting many tricky game sessions at once. Every session
+is a TrickyGameContext; remote players only get a turn once their move line
+has arrived, so a player waiting on a remote opponent never blocks anyone.
+
+Line protocol (one command per line):
+
+client -> server
+    PLAY AI       start a game against the server AI (client plays X)
+    PLAY PVP      wait for another client and play against it
+    MOVE <box>    mark a box, one per TURN, anything else is an ERROR
+    QUIT          close the connection
+
+server -> client
+    START <session id> <label>
+    TURN <board>      your move, board is 9 chars of X, O or .
+    OPPONENT <box>    the opponent marked box
+    ERROR <message>   invalid command or move
+    END WIN|LOSE|DRAW|TIMEOUT|ABANDONED
+"""
+
+DEFAULT_PORT = 8765
+
+
+class RemoteMoveProvider(MoveProvider):
+    """Returns the move a session received from the remote client"""
+
+    pending_move = None
+
+    def choose_move(self, context) -> int:
+        return self.pending_move
+
+
+class ClientConnection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.moves = asyncio.Queue()
+        self.session = None
+        self.awaiting_move = False
+
+    def send(self, line: str) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+    def discard_moves(self) -> None:
+        """Drops stale moves, keeping the disconnect marker"""
+        left = False
+        while not self.moves.empty():
+            left = left or self.moves.get_nowait() is None
+        if left:
+            self.moves.put_nowait(None)
+
+
+class GameSession:
+    """
+    One game between two sides, each one either a ClientConnection or None
+    for the server AI.
+    """
+
+    def __init__(self, session_id, connections, ai_provider, move_timeout):
+        self.session_id = session_id
+        self.connections = connections
+        self._move_timeout = move_timeout
+        self._players = []
+        for side, connection in enumerate(connections):
+            provider = ai_provider if connection is None else RemoteMoveProvider()
+            self._players.append(HeadlessPlayer(side + 1, "XO"[side], provider))
+        self._players[0].set_next_player(self._players[1])
+        self._players[1].set_next_player(self._players[0])
+        self.context = TrickyGameContext(
+            self._players[0], self._players[1], get_init_board(), verbose=False
+        )
+
+    def board_line(self) -> str:
+        return "".join(
+            box if isinstance(box, str) else "." for box in self.context.get_live_board
+        )
+
+    async def run(self) -> None:
+        for side, connection in enumerate(self.connections):
+            if connection is not None:
+                connection.session = self
+                connection.send(f"START {self.session_id} {'XO'[side]}")
+        try:
+            results = await self.__play()
+        finally:
+            for connection in self.connections:
+                if connection is not None:
+                    connection.session = None
+                    connection.awaiting_move = False
+                    connection.discard_moves()
+        for connection, result in zip(self.connections, results):
+            if connection is not None:
+                connection.send(f"END {result}")
+
+    async def __play(self):
+        context = self.context
+        while context.is_game_active:
+            side = context.current_side
+            connection = self.connections[side]
+            if connection is not None:
+                move = await self.__receive_move(connection)
+                if move is None:
+                    abandoned = ["WIN", "WIN"]
+                    abandoned[side] = "ABANDONED"
+                    return abandoned
+                if move == "timeout":
+                    timed_out = ["WIN", "WIN"]
+                    timed_out[side] = "TIMEOUT"
+                    return timed_out
+                self._players[side].move_provider.pending_move = move
+            context.play_turn()
+            move = self._players[side].movements[-1]
+            opponent = self.connections[1 - side]
+            if opponent is not None:
+                opponent.send(f"OPPONENT {move}")
+
+        if self._players[0].is_winner:
+            return ["WIN", "LOSE"]
+        if self._players[1].is_winner:
+            return ["LOSE", "WIN"]
+        return ["DRAW", "DRAW"]
+
+    async def __receive_move(self, connection: ClientConnection):
+        """A legal box, None if the client left or 'timeout'"""
+        bitboard = self.context.bitboard
+        connection.discard_moves()
+        while True:
+            connection.awaiting_move = True
+            connection.send(f"TURN {self.board_line()}")
+            try:
+                move = await asyncio.wait_for(
+                    connection.moves.get(), self._move_timeout
+                )
+            except asyncio.TimeoutError:
+                return "timeout"
+            finally:
+                connection.awaiting_move = False
+            if move is None:
+                return None
+            try:
+                box = int(move)
+            except ValueError:
+                connection.send("ERROR box must be a number")
+                continue
+            if box in bitboard.free_boxes:
+                return box
+            connection.send(f"ERROR box {move} is not available")
+
+
+class TrickyServer:
+    def __init__(self, move_timeout=30.0, idle_timeout=300.0):
+        self.move_timeout = move_timeout
+        self.idle_timeout = idle_timeout
+        self.ai_provider = MinimaxMoveProvider()
+        self.sessions_played = 0
+        self._session_ids = itertools.count(1)
+        self._waiting_connection = None
+        self._session_tasks = set()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT) -> asyncio.Server:
+        return await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+
+    def __start_session(self, connections) -> None:
+        session = GameSession(
+            next(self._session_ids), connections, self.ai_provider, self.move_timeout
+        )
+        for connection in connections:
+            if connection is not None:
+                connection.session = session
+        task = asyncio.create_task(session.run())
+        self._session_tasks.add(task)
+        task.add_done_callback(self.__session_done)
+
+    def __session_done(self, task) -> None:
+        self._session_tasks.discard(task)
+        self.sessions_played += 1
+
+    async def handle_client(self, reader, writer) -> None:
+        connection = ClientConnection(writer)
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                command = line.decode(errors="replace").split()
+                if not command:
+                    continue
+                if command[0] == "QUIT":
+                    break
+                self.__handle_command(connection, command)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if self._waiting_connection is connection:
+                self._waiting_connection = None
+            connection.moves.put_nowait(None)
+            writer.close()
+
+    def __handle_command(self, connection: ClientConnection, command) -> None:
+        if command[0] == "PLAY" and len(command) == 2:
+            if connection.session is not None or connection is self._waiting_connection:
+                connection.send("ERROR already playing")
+            elif command[1] == "AI":
+                self.__start_session([connection, None])
+            elif command[1] == "PVP":
+                if self._waiting_connection is None:
+                    self._waiting_connection = connection
+                else:
+                    opponent = self._waiting_connection
+                    self._waiting_connection = None
+                    self.__start_session([opponent, connection])
+            else:
+                connection.send("ERROR unknown game mode")
+        elif command[0] == "MOVE" and len(command) == 2:
+            if connection.session is None:
+                connection.send("ERROR no game in progress")
+                return
+            if not connection.awaiting_move:
+                connection.send("ERROR not your turn")
+                return
+            connection.awaiting_move = False
+            connection.moves.put_nowait(command[1])
+        else:
+            connection.send("ERROR unknown command")
+
+
+async def main(host, port, move_timeout, idle_timeout):
+    server = await TrickyServer(move_timeout, idle_timeout).serve(host, port)
+    print(f"Tricky server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session tricky game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--move-timeout", type=float, default=30.0)
+    parser.add_argument("--idle-timeout", type=float, default=300.0)
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(
+            main(
+                arguments.host,
+                arguments.port,
+                arguments.move_timeout,
+                arguments.idle_timeout,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,130 @@
+from board import get_init_board
+from game_context.context import TrickyGameContext
+from grid_board import GridBoard
+from headless_player import HeadlessPlayer
+from move_providers import MoveProvider
+
+"""
+Headless simulation of tricky games: no input and no printing, players are
+driven by move providers and the regular context state machine runs the game.
+"""
+
+
+class SimulationResult:
+
+    def __init__(self):
+        self.first_wins = 0
+        self.second_wins = 0
+        self.draws = 0
+        self.game_lengths = []
+
+    def __str__(self) -> str:
+        return (
+            f"{self.games} games: first provider won {self.first_wins}, "
+            f"second provider won {self.second_wins}, draws {self.draws}, "
+            f"average length {self.average_length:.2f} moves"
+        )
+
+    @property
+    def games(self) -> int:
+        return len(self.game_lengths)
+
+    @property
+    def average_length(self) -> float:
+        return sum(self.game_lengths) / self.games if self.games else 0.0
+
+    def add_game(self, winner, game_length: int) -> None:
+        if winner == 0:
+            self.first_wins += 1
+        elif winner == 1:
+            self.second_wins += 1
+        else:
+            self.draws += 1
+        self.game_lengths.append(game_length)
+
+
+def play_headless_game(
+    first_provider: MoveProvider,
+    second_provider: MoveProvider,
+    size: int = 3,
+    in_a_row: int = 3,
+    hooks=None,
+):
+    """
+    Play one game where first_provider moves first, on a size x size board
+    won with in_a_row marks (the classic 3x3 board by default). hooks are
+    the instrumentation.EventHooks of the game context, if any.
+    Returns (winner, game_length), winner being 0, 1 or None for a tie.
+    """
+    first_provider.new_game()
+    second_provider.new_game()
+    player1 = HeadlessPlayer(1, "X", first_provider)
+    player2 = HeadlessPlayer(2, "O", second_provider)
+    player1.set_next_player(player2)
+    player2.set_next_player(player1)
+    board_state = None
+    if (size, in_a_row) != (3, 3):
+        board_state = GridBoard(size, in_a_row)
+    game_context = TrickyGameContext(
+        player1,
+        player2,
+        get_init_board(size),
+        verbose=False,
+        board_state=board_state,
+        hooks=hooks,
+    )
+    while game_context.is_game_active:
+        game_context.play_turn()
+
+    winner = 0 if player1.is_winner else 1 if player2.is_winner else None
+    return winner, len(game_context.get_game_occupied_boxes)
+
+
+def run_games(
+    games: int,
+    first_provider: MoveProvider,
+    second_provider: MoveProvider,
+    alternate_start: bool = False,
+    size: int = 3,
+    in_a_row: int = 3,
+    hooks=None,
+) -> SimulationResult:
+    """
+    Play `games` headless games and aggregate the results per provider.
+    With alternate_start the providers swap who moves first every game.
+    """
+    result = SimulationResult()
+    for game in range(games):
+        swapped = alternate_start and game % 2 == 1
+        if swapped:
+            winner, game_length = play_headless_game(
+                second_provider, first_provider, size, in_a_row, hooks
+            )
+            if winner is not None:
+                winner = 1 - winner
+        else:
+            winner, game_length = play_headless_game(
+                first_provider, second_provider, size, in_a_row, hooks
+            )
+        result.add_game(winner, game_length)
+
+    return result
+
+
+if __name__ == "__main__":
+    import json
+    import random
+    from instrumentation import EventHooks, Metrics
+    from move_providers import RandomMoveProvider
+
+    hooks = EventHooks()
+    metrics = Metrics(hooks)
+    print(
+        run_games(
+            10000,
+            RandomMoveProvider(random.Random(1)),
+            RandomMoveProvider(random.Random(2)),
+            hooks=hooks,
+        )
+    )
+    print(json.dumps(metrics.to_json(), indent=2))
@@ -10,11 +10,24 @@ winner_moves = [
 ]
 
 
-def verify_tricky_winner(player_moves):
-    game_has_winner = False
-    for moves in winner_moves:
-        if all(m in player_moves for m in moves):
-            game_has_winner = True
-            break
+def moves_to_mask(player_moves) -> int:
+    """Encode a list of boxes (1-9) as a 9-bit mask, box N being bit N-1."""
+    mask = 0
+    for move in player_moves:
+        mask |= 1 << (move - 1)
+    return mask
+
+
+winner_masks = tuple(moves_to_mask(moves) for moves in winner_moves)
 
-    return game_has_winner
+"""
+Every possible set of marks of one player fits in 9 bits, so the winner check
+is precomputed once for the 512 masks and becomes a single index lookup.
+"""
+WIN_TABLE = tuple(
+    any(mask & line == line for line in winner_masks) for mask in range(1 << 9)
+)
+
+
+def verify_tricky_winner(player_moves):
+    return WIN_TABLE[moves_to_mask(player_moves)]
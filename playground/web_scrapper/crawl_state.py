@@ -0,0 +1,294 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import aclosing
+
+from crawler import RETRY_STATUSES, CrawlResult, Crawler, Frontier, PageRangeFrontier
+from extraction import extract_quotes
+from http_cache import HttpCache
+
+"""
+Persistent crawl progress. A crawl runs in passes; CrawlState keeps, in one
+SQLite file, the URLs of the current pass (pending or done), the content hash
+of every page and where its extracted records are in an append-only JSONL
+file, plus the frontier's own progress.
+
+Progress is saved by checkpoints (every `checkpoint_every` pages or
+`checkpoint_interval` seconds), one transaction each, after the records file
+is synced. An interrupted pass resumes from its last checkpoint: records
+written after it are truncated away and pages done after it are fetched
+again. A new pass over an unchanged page only compares hashes, the records
+of a page are extracted again only when its content hash changed.
+
+    python crawl_state.py http://quotes.toscrape.com/page/ --state .crawl
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    pass INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    content_hash TEXT,
+    records_offset INTEGER,
+    records_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class CrawlState:
+    def __init__(self, directory: str, checkpoint_every=100, checkpoint_interval=5.0):
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        os.makedirs(directory, exist_ok=True)
+        self.__db = sqlite3.connect(os.path.join(directory, "state.db"))
+        self.__db.executescript(SCHEMA)
+        self.__records_path = os.path.join(directory, "records.jsonl")
+        self.pass_number = int(self.__meta("pass", 0))
+        self.in_progress = self.__meta("in_progress", "0") == "1"
+        # Drop records written after the last checkpoint of an interrupted pass
+        self.__records = open(self.__records_path, "ab")
+        self.__records.truncate(int(self.__meta("records_size", 0)))
+        self.__records.seek(0, os.SEEK_END)
+        self.__changes = {}
+        self.__pages_since_checkpoint = 0
+        self.__last_checkpoint = time.monotonic()
+        self.pages_changed = 0
+        self.pages_unchanged = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_pass(self) -> None:
+        self.pass_number += 1
+        self.in_progress = True
+
+    def frontier_checkpoint(self) -> dict:
+        return json.loads(self.__meta("frontier", "{}"))
+
+    def pending_urls(self) -> list[str]:
+        rows = self.__db.execute(
+            "SELECT url FROM urls WHERE pass = ? AND done = 0", (self.pass_number,)
+        )
+        return [url for (url,) in rows]
+
+    def is_done(self, url: str) -> bool:
+        change = self.__changes.get(url)
+        if change is not None:
+            return change["pass"] == self.pass_number and change["done"]
+        row = self.__db.execute(
+            "SELECT 1 FROM urls WHERE url = ? AND pass = ? AND done = 1",
+            (url, self.pass_number),
+        ).fetchone()
+        return row is not None
+
+    def add_pending(self, urls) -> None:
+        for url in urls:
+            if not self.is_done(url):
+                self.__change(url, done=0)
+
+    def mark_done(self, url: str) -> None:
+        self.__change(url, done=1)
+
+    def content_changed(self, result: CrawlResult) -> bool:
+        """Whether the body of result differs from the last one recorded"""
+        content_hash = hashlib.sha256(result.body).hexdigest()
+        return content_hash != self.__stored(result.url).get("content_hash")
+
+    def record_page(self, result: CrawlResult, extract) -> bool:
+        """
+        Marks result done, storing extract(body) records if the content
+        changed since the last pass. Returns whether it changed.
+        """
+        content_hash = hashlib.sha256(result.body).hexdigest()
+        if content_hash == self.__stored(result.url).get("content_hash"):
+            self.pages_unchanged += 1
+            self.mark_done(result.url)
+            return False
+        records = extract(result.body)
+        offset = self.__records.tell()
+        for record in records:
+            line = json.dumps({"url": result.url, **record}, ensure_ascii=False)
+            self.__records.write(line.encode() + b"\n")
+        self.pages_changed += 1
+        self.__change(
+            result.url,
+            done=1,
+            content_hash=content_hash,
+            records_offset=offset,
+            records_count=len(records),
+        )
+        return True
+
+    def checkpoint_due(self) -> bool:
+        self.__pages_since_checkpoint += 1
+        return (
+            self.__pages_since_checkpoint >= self.checkpoint_every
+            or time.monotonic() - self.__last_checkpoint >= self.checkpoint_interval
+        )
+
+    def checkpoint(self, frontier_checkpoint: dict, finished=False) -> None:
+        self.__records.flush()
+        os.fsync(self.__records.fileno())
+        if finished:
+            self.in_progress = False
+        with self.__db:
+            self.__db.executemany(
+                "INSERT OR REPLACE INTO urls VALUES"
+                " (:url, :pass, :done, :content_hash, :records_offset, :records_count)",
+                self.__changes.values(),
+            )
+            self.__db.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    ("pass", str(self.pass_number)),
+                    ("in_progress", "1" if self.in_progress else "0"),
+                    ("frontier", json.dumps(frontier_checkpoint)),
+                    ("records_size", str(self.__records.tell())),
+                ],
+            )
+        self.__changes = {}
+        self.__pages_since_checkpoint = 0
+        self.__last_checkpoint = time.monotonic()
+
+    def records(self):
+        """Records of the latest content of every page, read back from disk"""
+        self.__records.flush()
+        rows = self.__db.execute(
+            "SELECT records_offset, records_count FROM urls"
+            " WHERE records_count > 0 ORDER BY records_offset"
+        ).fetchall()
+        with open(self.__records_path, "rb") as records_file:
+            for offset, count in rows:
+                records_file.seek(offset)
+                for _ in range(count):
+                    yield json.loads(records_file.readline())
+
+    def close(self) -> None:
+        self.__records.close()
+        self.__db.close()
+
+    def __meta(self, key: str, default):
+        row = self.__db.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row is not None else default
+
+    def __stored(self, url: str) -> dict:
+        """Row of url with the changes not checkpointed yet"""
+        change = self.__changes.get(url)
+        if change is not None:
+            return change
+        row = self.__db.execute(
+            "SELECT content_hash, records_offset, records_count FROM urls WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return {}
+        return dict(zip(("content_hash", "records_offset", "records_count"), row))
+
+    def __change(self, url: str, done: int, **columns) -> None:
+        change = {"url": url, "pass": self.pass_number, "done": done}
+        stored = self.__stored(url)
+        for column in ("content_hash", "records_offset", "records_count"):
+            change[column] = columns.get(column, stored.get(column))
+        self.__changes[url] = change
+
+
+def is_final(result: CrawlResult) -> bool:
+    """Failed fetches (no response or a retryable status) stay pending"""
+    return result.status is not None and result.status not in RETRY_STATUSES
+
+
+class ResumableFrontier(Frontier):
+    """
+    Wraps a frontier so that its URLs and progress go through a CrawlState:
+    a pass in progress is resumed from the pending URLs, done ones are not
+    crawled again within the pass.
+    """
+
+    def __init__(self, frontier: Frontier, state: CrawlState):
+        self.frontier = frontier
+        self.state = state
+
+    def seed(self) -> list[str]:
+        if self.state.in_progress:
+            self.frontier.restore(self.state.frontier_checkpoint())
+            return self.state.pending_urls()
+        self.state.start_pass()
+        urls = self.frontier.seed()
+        self.state.add_pending(urls)
+        return urls
+
+    def discover(self, result: CrawlResult) -> list[str]:
+        urls = [
+            url for url in self.frontier.discover(result) if not self.state.is_done(url)
+        ]
+        self.state.add_pending(urls)
+        if not self.frontier.wanted(result) and is_final(result):
+            self.state.mark_done(result.url)
+        return urls
+
+    def wanted(self, result: CrawlResult) -> bool:
+        return self.frontier.wanted(result)
+
+    def checkpoint(self) -> dict:
+        return self.frontier.checkpoint()
+
+    def restore(self, checkpoint: dict) -> None:
+        self.frontier.restore(checkpoint)
+
+
+async def crawl_incrementally(
+    crawler: Crawler, frontier: Frontier, state: CrawlState, extract
+) -> None:
+    """Runs (or resumes) a pass, storing extract(body) records of changed pages"""
+    resumable = ResumableFrontier(frontier, state)
+    async with aclosing(crawler.crawl(resumable)) as results:
+        async for result in results:
+            if result.ok:
+                state.record_page(result, extract)
+            elif is_final(result):
+                state.mark_done(result.url)
+            if state.checkpoint_due():
+                state.checkpoint(resumable.checkpoint())
+    state.checkpoint(resumable.checkpoint())
+    if not state.pending_urls():
+        state.checkpoint(resumable.checkpoint(), finished=True)
+
+
+async def main(arguments) -> None:
+    cache = HttpCache(arguments.cache) if arguments.cache else None
+    crawler = Crawler(arguments.concurrency, cache=cache)
+    frontier = PageRangeFrontier(arguments.url, window=arguments.concurrency)
+    with CrawlState(arguments.state) as state:
+        resumed = state.in_progress
+        started = time.perf_counter()
+        try:
+            await crawl_incrementally(crawler, frontier, state, extract_quotes)
+        finally:
+            if cache is not None:
+                cache.close()
+        print(
+            f"pass {state.pass_number}{' (resumed)' if resumed else ''}:"
+            f" {state.pages_changed} pages changed, {state.pages_unchanged}"
+            f" unchanged in {time.perf_counter() - started:.2f}s"
+        )
+        authors = {record["author"] for record in state.records()}
+        print(f"{len(authors)} unique authors")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumable, incremental crawl")
+    parser.add_argument("url", nargs="?", default="http://quotes.toscrape.com/page/")
+    parser.add_argument("--state", default=".crawl_state")
+    parser.add_argument("--cache", help="directory of the on-disk HTTP cache")
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,358 @@
+import argparse
+import asyncio
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import aiohttp
+
+from http_cache import CacheEntry, HttpCache
+
+"""
+Concurrent crawler: one pooled keep-alive aiohttp session, at most
+`concurrency` requests in flight, retries with exponential backoff (and
+jitter) on connection errors, timeouts, 429 and 5xx. What to crawl is
+decided by a Frontier: a page range that stops at the last page, or
+link following from start URLs. With an HttpCache, cached pages are
+revalidated with conditional requests and 304s are served from disk; the
+cache's SQLite and file I/O runs in worker threads, off the event loop.
+
+    python crawler.py --fixture --pages 50 --latency 0.05 --concurrency 16
+    python crawler.py http://quotes.toscrape.com/page/ --cache .http_cache
+"""
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LINK_PATTERN = re.compile(rb"""href\s*=\s*["']([^"'#]+)""")
+
+
+class CrawlResult:
+    def __init__(self, url, status, body=b"", headers=None, elapsed=0.0, attempts=1):
+        self.url = url
+        # None when every attempt failed without a response, see error
+        self.status = status
+        self.body = body
+        self.headers = headers if headers is not None else {}
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.error = None
+        # The server answered 304 and body came from the HttpCache
+        self.from_cache = False
+
+    def __repr__(self) -> str:
+        return (
+            f"CrawlResult({self.url!r}, status={self.status}, {len(self.body)} bytes)"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+class Frontier(ABC):
+    """Decides which URLs are crawled and which results are part of the crawl"""
+
+    @abstractmethod
+    def seed(self) -> list[str]:
+        pass
+
+    @abstractmethod
+    def discover(self, result: CrawlResult) -> list[str]:
+        """URLs to crawl next, now that result arrived"""
+        pass
+
+    def wanted(self, result: CrawlResult) -> bool:
+        return True
+
+    def checkpoint(self) -> dict:
+        """JSON-serializable progress, see restore()"""
+        return {}
+
+    def restore(self, checkpoint: dict) -> None:
+        """Continues from the progress saved by checkpoint()"""
+        pass
+
+
+class PageRangeFrontier(Frontier):
+    """
+    Pages prefix + 1, 2, ... up to last_page, or until a page contains
+    end_marker (or is missing) when last_page is None. Up to `window` pages
+    are requested ahead, pages past the end are dropped.
+    """
+
+    def __init__(
+        self,
+        url_prefix: str,
+        first_page=1,
+        last_page=None,
+        end_marker=b"No quotes found!",
+        window=8,
+    ):
+        self.url_prefix = url_prefix
+        self.end_marker = end_marker
+        self.end_page = last_page + 1 if last_page is not None else None
+        self.window = window
+        self.__next_page = first_page
+
+    def seed(self) -> list[str]:
+        return [url for url in (self.__take_page() for _ in range(self.window)) if url]
+
+    def discover(self, result: CrawlResult) -> list[str]:
+        page = self.page_of(result.url)
+        if result.status == 404 or (result.ok and self.end_marker in result.body):
+            if self.end_page is None or page < self.end_page:
+                self.end_page = page
+            return []
+        next_url = self.__take_page()
+        return [next_url] if next_url else []
+
+    def wanted(self, result: CrawlResult) -> bool:
+        return self.end_page is None or self.page_of(result.url) < self.end_page
+
+    def checkpoint(self) -> dict:
+        return {"next_page": self.__next_page, "end_page": self.end_page}
+
+    def restore(self, checkpoint: dict) -> None:
+        self.__next_page = checkpoint["next_page"]
+        self.end_page = checkpoint["end_page"]
+
+    def page_of(self, url: str) -> int:
+        return int(url[len(self.url_prefix) :])
+
+    def __take_page(self):
+        if self.end_page is not None and self.__next_page >= self.end_page:
+            return None
+        url = f"{self.url_prefix}{self.__next_page}"
+        self.__next_page += 1
+        return url
+
+
+class LinkFrontier(Frontier):
+    """Follows href links of crawled pages, on the start hosts by default"""
+
+    def __init__(self, start_urls, max_pages=1000, same_host=True):
+        self.start_urls = list(start_urls)
+        self.max_pages = max_pages
+        self.hosts = {urlsplit(url).netloc for url in self.start_urls}
+        self.same_host = same_host
+        self.__queued = set()
+
+    def seed(self) -> list[str]:
+        return self.__admit(self.start_urls)
+
+    def discover(self, result: CrawlResult) -> list[str]:
+        if not result.ok:
+            return []
+        links = (
+            urldefrag(urljoin(result.url, match.decode(errors="ignore")))[0]
+            for match in LINK_PATTERN.findall(result.body)
+        )
+        return self.__admit(links)
+
+    def checkpoint(self) -> dict:
+        return {"queued": sorted(self.__queued)}
+
+    def restore(self, checkpoint: dict) -> None:
+        self.__queued = set(checkpoint["queued"])
+
+    def __admit(self, urls) -> list[str]:
+        admitted = []
+        for url in urls:
+            if len(self.__queued) >= self.max_pages:
+                break
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or url in self.__queued:
+                continue
+            if self.same_host and parts.netloc not in self.hosts:
+                continue
+            self.__queued.add(url)
+            admitted.append(url)
+        return admitted
+
+
+class Crawler:
+    def __init__(
+        self,
+        concurrency=8,
+        retries=3,
+        backoff=0.2,
+        timeout=10.0,
+        headers=None,
+        cache: HttpCache = None,
+    ):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = headers
+        self.cache = cache
+        self.requests = 0
+        self.__rng = random.Random()
+
+    def run(self, frontier: Frontier) -> list[CrawlResult]:
+        """Crawl from synchronous code, returning every wanted result"""
+
+        async def collect():
+            return [result async for result in self.crawl(frontier)]
+
+        return asyncio.run(collect())
+
+    async def crawl(self, frontier: Frontier):
+        """Async iterator of the wanted results, in completion order"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers,
+        ) as session:
+            queued = deque(frontier.seed())
+            scheduled = set(queued)
+            in_flight = set()
+            done = set()
+            try:
+                while queued or in_flight:
+                    while queued and len(in_flight) < self.concurrency:
+                        in_flight.add(
+                            asyncio.create_task(self.fetch(session, queued.popleft()))
+                        )
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        result = task.result()
+                        for url in frontier.discover(result):
+                            if url not in scheduled:
+                                scheduled.add(url)
+                                queued.append(url)
+                        if frontier.wanted(result):
+                            yield result
+            finally:
+                # The consumer stopped early or raised: no fetch may outlive
+                # the session, and unread results mustn't log as never retrieved
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, *done, return_exceptions=True)
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> CrawlResult:
+        started = time.perf_counter()
+        entry = None
+        if self.cache is not None:
+            entry = await asyncio.to_thread(self.cache.lookup, url)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.requests += 1
+            error = None
+            headers = entry.conditional_headers if entry is not None else None
+            try:
+                async with session.get(url, headers=headers) as response:
+                    body = await response.read()
+                    if response.status == 304 and entry is not None:
+                        result = await self.__cached_result(entry, started, attempt)
+                        if result is not None:
+                            return result
+                        # The cached body is gone, ask again for the full page
+                        entry = None
+                        attempt -= 1
+                        continue
+                    if response.status not in RETRY_STATUSES or attempt > self.retries:
+                        if response.status == 200 and self.cache is not None:
+                            await asyncio.to_thread(
+                                self.cache.store, url, body, response.headers
+                            )
+                        return CrawlResult(
+                            url,
+                            response.status,
+                            body,
+                            dict(response.headers),
+                            time.perf_counter() - started,
+                            attempt,
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                error = exc
+            if attempt > self.retries:
+                result = CrawlResult(
+                    url, None, elapsed=time.perf_counter() - started, attempts=attempt
+                )
+                result.error = repr(error)
+                return result
+            # Exponential backoff with full jitter
+            await asyncio.sleep(
+                self.__rng.uniform(0, self.backoff * 2 ** (attempt - 1))
+            )
+
+    async def __cached_result(self, entry: CacheEntry, started: float, attempt: int):
+        body = await asyncio.to_thread(self.cache.read_body, entry)
+        if body is None:
+            return None
+        headers = {"Content-Type": entry.content_type} if entry.content_type else {}
+        result = CrawlResult(
+            entry.url, 200, body, headers, time.perf_counter() - started, attempt
+        )
+        result.from_cache = True
+        return result
+
+
+async def crawl_fixture(arguments) -> None:
+    from fixture_server import DEFAULT_PORT, FixtureSite
+
+    site = FixtureSite(
+        arguments.pages,
+        arguments.latency,
+        arguments.jitter,
+        arguments.failure_rate,
+    )
+    runner = await site.start(port=DEFAULT_PORT)
+    try:
+        frontier = PageRangeFrontier(
+            f"http://127.0.0.1:{DEFAULT_PORT}/page/", window=arguments.concurrency
+        )
+        await report_crawl(arguments, frontier)
+        print(f"fixture served {site.requests} requests, {site.failures} failed")
+    finally:
+        await runner.cleanup()
+
+
+async def report_crawl(arguments, frontier: Frontier) -> None:
+    cache = HttpCache(arguments.cache) if arguments.cache else None
+    crawler = Crawler(arguments.concurrency, arguments.retries, cache=cache)
+    started = time.perf_counter()
+    try:
+        results = [result async for result in crawler.crawl(frontier)]
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results if not result.ok)
+    cached = sum(1 for result in results if result.from_cache)
+    print(
+        f"{len(results)} pages ({failed} failed, {cached} from cache) in"
+        f" {elapsed:.2f}s: {len(results) / elapsed:.1f} pages/s,"
+        f" {crawler.requests} requests"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent quotes crawler")
+    parser.add_argument("url", nargs="?", default="http://quotes.toscrape.com/page/")
+    parser.add_argument("--follow-links", action="store_true")
+    parser.add_argument("--max-pages", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--cache", help="directory of the on-disk HTTP cache")
+    parser.add_argument("--fixture", action="store_true", help="crawl a local site")
+    parser.add_argument("--pages", type=int, default=50, help="fixture pages")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    arguments = parser.parse_args()
+    if arguments.fixture:
+        asyncio.run(crawl_fixture(arguments))
+    elif arguments.follow_links:
+        frontier = LinkFrontier([arguments.url], arguments.max_pages)
+        asyncio.run(report_crawl(arguments, frontier))
+    else:
+        frontier = PageRangeFrontier(arguments.url, window=arguments.concurrency)
+        asyncio.run(report_crawl(arguments, frontier))
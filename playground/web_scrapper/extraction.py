@@ -0,0 +1,77 @@
+from lxml import etree
+
+"""
+Targeted HTML extraction straight from response bytes. The lxml parser is
+driven with a parser target: it reports start/data/end events and never
+builds a tree, so only the text of the selected elements is kept and the
+rest of the page is discarded as it is parsed. Bytes can be fed in chunks
+while they arrive.
+
+Fields are selected by CSS class, e.g. {"authors": "author"} gathers the
+text of every element with class "author" (like soup.select(".author")).
+"""
+
+QUOTE_FIELDS = {"authors": "author", "quotes": "text"}
+
+
+class _FieldTarget:
+    def __init__(self, fields: dict[str, str]):
+        self.__field_of_class = {
+            css_class: field for field, css_class in fields.items()
+        }
+        self.values = {field: [] for field in fields}
+        # Open elements being captured: (field, depth, text parts)
+        self.__captures = []
+        self.__depth = 0
+
+    def start(self, tag, attrib):
+        self.__depth += 1
+        classes = attrib.get("class")
+        if classes:
+            for css_class in classes.split():
+                field = self.__field_of_class.get(css_class)
+                if field is not None:
+                    self.__captures.append((field, self.__depth, []))
+
+    def data(self, text):
+        for _, _, parts in self.__captures:
+            parts.append(text)
+
+    def end(self, tag):
+        while self.__captures and self.__captures[-1][1] == self.__depth:
+            field, _, parts = self.__captures.pop()
+            self.values[field].append("".join(parts))
+        self.__depth -= 1
+
+    def close(self):
+        return self.values
+
+
+class StreamingExtractor:
+    """feed() page bytes as they come, close() returns {field: [texts]}"""
+
+    def __init__(self, fields: dict[str, str] = QUOTE_FIELDS, encoding="utf-8"):
+        self.__parser = etree.HTMLParser(target=_FieldTarget(fields), encoding=encoding)
+
+    def feed(self, chunk: bytes) -> None:
+        self.__parser.feed(chunk)
+
+    def close(self) -> dict[str, list[str]]:
+        return self.__parser.close()
+
+
+def extract_fields(
+    body: bytes, fields: dict[str, str] = QUOTE_FIELDS, encoding="utf-8"
+) -> dict[str, list[str]]:
+    extractor = StreamingExtractor(fields, encoding)
+    extractor.feed(body)
+    return extractor.close()
+
+
+def extract_quotes(body: bytes) -> list[dict]:
+    """One {"text", "author"} record per quote of a quotes page"""
+    fields = extract_fields(body)
+    return [
+        {"text": text, "author": author}
+        for text, author in zip(fields["quotes"], fields["authors"])
+    ]
@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from aiohttp import web
+
+"""
+Local stand-in for quotes.toscrape.com: deterministic quote pages with the
+same markup (.quote, .text, .author, li.next pagination), author pages, and
+the "No quotes found!" page past the last one. Every response can be delayed
+(latency + random jitter) and a fraction of them can fail with 503, so
+crawlers can be measured and their retries exercised without the network.
+Pages carry ETag and Last-Modified and answer conditional requests with 304;
+edit_page() changes a page, like a site update between two crawls.
+
+    python fixture_server.py --pages 50 --latency 0.05
+"""
+
+DEFAULT_PORT = 8780
+QUOTES_PER_PAGE = 10
+
+AUTHORS = [
+    "Albert Einstein",
+    "J.K. Rowling",
+    "Jane Austen",
+    "Marilyn Monroe",
+    "Andre Gide",
+    "Thomas A. Edison",
+    "Eleanor Roosevelt",
+    "Steve Martin",
+    "Mark Twain",
+    "Charles Bukowski",
+]
+WORDS = (
+    "the world as we have created it is a process of our thinking it cannot be "
+    "changed without changing life what you are doing to others love simple"
+).split()
+TAGS = ["change", "deep-thoughts", "thinking", "world", "life", "love", "humor"]
+
+
+def author_slug(author: str) -> str:
+    return "".join(c if c.isalnum() else "-" for c in author).strip("-")
+
+
+def quote_text(page: int, index: int, revision: int = 0) -> str:
+    rng = random.Random((revision * 100_000 + page) * 1000 + index)
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 24))).capitalize()
+
+
+def quote_html(page: int, index: int, revision: int = 0) -> str:
+    rng = random.Random((revision * 100_000 + page) * 1000 + index)
+    author = rng.choice(AUTHORS)
+    tags = "".join(
+        f'<a class="tag" href="/tag/{tag}/page/1/">{tag}</a>'
+        for tag in rng.sample(TAGS, 2)
+    )
+    return f"""
+    <div class="quote" itemscope itemtype="http://schema.org/CreativeWork">
+        <span class="text" itemprop="text">“{quote_text(page, index, revision)}.”</span>
+        <span>by <small class="author" itemprop="author">{author}</small>
+        <a href="/author/{author_slug(author)}">(about)</a>
+        </span>
+        <div class="tags">Tags: {tags}</div>
+    </div>"""
+
+
+def page_html(page: int, pages: int, revision: int = 0) -> str:
+    if page > pages:
+        body = "No quotes found!"
+    else:
+        body = "".join(
+            quote_html(page, index, revision) for index in range(QUOTES_PER_PAGE)
+        )
+        if page < pages:
+            body += f'<nav><ul class="pager"><li class="next"><a href="/page/{page + 1}/">Next</a></li></ul></nav>'
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Quotes to Scrape</title></head>
+<body>
+<div class="container">
+    <div class="header-box"><h1><a href="/">Quotes to Scrape</a></h1></div>
+    <div class="row"><div class="col-md-8">{body}</div></div>
+</div>
+<footer class="footer">Quotes by: <a href="https://www.goodreads.com/quotes">GoodReads.com</a></footer>
+</body>
+</html>"""
+
+
+def author_html(author: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><title>Quotes to Scrape</title></head>
+<body><div class="author-details">
+<h3 class="author-title">{author}</h3>
+<div class="author-description">{quote_text(len(author), 0)}.</div>
+<a href="/">Home</a>
+</div></body></html>"""
+
+
+class FixtureSite:
+    def __init__(self, pages=10, latency=0.0, jitter=0.0, failure_rate=0.0, seed=0):
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self.not_modified = 0
+        # Edited pages: page -> (revision, modification time)
+        self.__edits = {}
+        self.__created_at = time.time()
+        self.__rng = random.Random(seed)
+        self.__authors = {author_slug(author): author for author in AUTHORS}
+
+    def edit_page(self, page: int) -> None:
+        """Changes the quotes of page, its validators change with them"""
+        revision = self.__edits.get(page, (0, 0))[0] + 1
+        self.__edits[page] = (revision, time.time())
+
+    def application(self) -> web.Application:
+        app = web.Application(middlewares=[self.__delay_and_fail])
+        app.router.add_get("/", self.__page)
+        app.router.add_get("/page/{page:\\d+}/", self.__page)
+        app.router.add_get("/page/{page:\\d+}", self.__page)
+        app.router.add_get("/author/{slug}", self.__author)
+        return app
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT) -> web.AppRunner:
+        """Serves the site in the running loop; await runner.cleanup() to stop"""
+        runner = web.AppRunner(self.application(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    @web.middleware
+    async def __delay_and_fail(self, request, handler):
+        self.requests += 1
+        delay = self.latency + self.__rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.__rng.random() < self.failure_rate:
+            self.failures += 1
+            return web.Response(status=503, text="Service Unavailable")
+        return await handler(request)
+
+    async def __page(self, request):
+        page = int(request.match_info.get("page", 1))
+        revision, modified_at = self.__edits.get(page, (0, self.__created_at))
+        return self.__respond(
+            request, page_html(page, self.pages, revision), modified_at
+        )
+
+    async def __author(self, request):
+        author = self.__authors.get(request.match_info["slug"])
+        if author is None:
+            raise web.HTTPNotFound()
+        return self.__respond(request, author_html(author), self.__created_at)
+
+    def __respond(self, request, html: str, modified_at: float) -> web.Response:
+        body = html.encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        last_modified = formatdate(int(modified_at), usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if self.__not_modified(request, etag, int(modified_at)):
+            self.not_modified += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type="text/html", headers=headers)
+
+    @staticmethod
+    def __not_modified(request, etag: str, modified_at: int) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in (tag.strip() for tag in if_none_match.split(","))
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            return modified_at <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local quotes site for crawlers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    arguments = parser.parse_args()
+    site = FixtureSite(
+        arguments.pages, arguments.latency, arguments.jitter, arguments.failure_rate
+    )
+    web.run_app(
+        site.application(), host=arguments.host, port=arguments.port, access_log=None
+    )
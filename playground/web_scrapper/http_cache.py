@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+"""
+On-disk HTTP response cache. Bodies are stored content-addressed (one file
+per SHA-256, shared by URLs serving the same bytes) and an SQLite index maps
+every URL to its body and validators (ETag, Last-Modified). On a re-crawl
+the stored validators become If-None-Match / If-Modified-Since headers and a
+304 answer is served from disk. When the stored bodies outgrow max_bytes the
+least recently used URLs are evicted.
+
+The cache may be used from several threads (the crawler calls it through
+asyncio.to_thread), every public method holds one lock.
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    body_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+class CacheEntry:
+    def __init__(self, url, body_hash, size, etag, last_modified, content_type):
+        self.url = url
+        self.body_hash = body_hash
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+
+    @property
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    def __init__(self, directory: str, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Responses served from disk after a 304 / full responses received
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__index = sqlite3.connect(
+            os.path.join(directory, "index.db"), check_same_thread=False
+        )
+        self.__index.execute("PRAGMA journal_mode=WAL")
+        self.__index.executescript(SCHEMA)
+        self.__stored_bytes = self.__index.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM"
+            " (SELECT DISTINCT body_hash, size FROM entries)"
+        ).fetchone()[0]
+        # max_bytes may be lower than when the cache was filled
+        with self.__index:
+            self.__evict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def stored_bytes(self) -> int:
+        """Size of the distinct bodies on disk"""
+        return self.__stored_bytes
+
+    def lookup(self, url: str):
+        """CacheEntry of url, None if it isn't cached"""
+        with self.__lock:
+            row = self.__index.execute(
+                "SELECT url, body_hash, size, etag, last_modified, content_type"
+                " FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CacheEntry(*row) if row is not None else None
+
+    def read_body(self, entry: CacheEntry):
+        """Cached body of entry, None if its file went missing"""
+        with self.__lock:
+            try:
+                with open(self.__object_path(entry.body_hash), "rb") as body_file:
+                    body = body_file.read()
+            except FileNotFoundError:
+                with self.__index:
+                    self.__remove(entry.url, entry.body_hash, entry.size)
+                return None
+            self.hits += 1
+            with self.__index:
+                self.__index.execute(
+                    "UPDATE entries SET last_used = ? WHERE url = ?",
+                    (time.time(), entry.url),
+                )
+        return body
+
+    def store(self, url: str, body: bytes, headers) -> bool:
+        """
+        Caches a 200 response when it has validators to revalidate with.
+        Returns whether it was stored.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        cacheable = etag or last_modified
+        # Hashing doesn't need the lock
+        body_hash = hashlib.sha256(body).hexdigest() if cacheable else None
+        with self.__lock:
+            self.misses += 1
+            if not cacheable:
+                return False
+            self.__store(
+                url, body, body_hash, etag, last_modified, headers.get("Content-Type")
+            )
+        return True
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__index.close()
+
+    def __store(self, url, body, body_hash, etag, last_modified, content_type):
+        path = self.__object_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as body_file:
+                body_file.write(body)
+            os.replace(temporary_path, path)
+            self.__stored_bytes += len(body)
+        with self.__index:
+            previous = self.__index.execute(
+                "SELECT body_hash, size FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            self.__index.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    body_hash,
+                    len(body),
+                    etag,
+                    last_modified,
+                    content_type,
+                    time.time(),
+                ),
+            )
+            if previous is not None and previous[0] != body_hash:
+                self.__release_body(*previous)
+            self.__evict()
+
+    def __evict(self) -> None:
+        while self.__stored_bytes > self.max_bytes:
+            row = self.__index.execute(
+                "SELECT url, body_hash, size FROM entries ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self.__remove(*row)
+
+    def __remove(self, url: str, body_hash: str, size: int) -> None:
+        self.__index.execute("DELETE FROM entries WHERE url = ?", (url,))
+        self.__release_body(body_hash, size)
+
+    def __release_body(self, body_hash: str, size: int) -> None:
+        """Deletes the body file once no URL refers to it"""
+        still_used = self.__index.execute(
+            "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone()
+        if still_used:
+            return
+        self.__stored_bytes -= size
+        try:
+            os.remove(self.__object_path(body_hash))
+        except FileNotFoundError:
+            pass
+
+    def __object_path(self, body_hash: str) -> str:
+        return os.path.join(self.directory, "objects", body_hash[:2], body_hash)
+
+
+def get_with_cache(session, cache: HttpCache, url: str):
+    """
+    GET url with a requests.Session, revalidating the cached copy if any.
+    Returns (status, body), status 200 also when the body came from the cache.
+    """
+    entry = cache.lookup(url)
+    headers = entry.conditional_headers if entry is not None else None
+    response = session.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        body = cache.read_body(entry)
+        if body is not None:
+            return 200, body
+        response = session.get(url)
+    if response.status_code == 200:
+        cache.store(url, response.content, response.headers)
+    return response.status_code, response.content
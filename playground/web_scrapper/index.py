@@ -1,11 +1,21 @@
+import asyncio
+
 import requests
-import bs4
 
+from crawl_state import CrawlState, crawl_incrementally
+from crawler import Crawler, PageRangeFrontier
+from extraction import extract_fields, extract_quotes
+from http_cache import HttpCache, get_with_cache
+
+# One keep-alive session, and pages unchanged since the last run come from disk
+session = requests.Session()
+cache = HttpCache(".http_cache")
 
-res = requests.get("http://quotes.toscrape.com/")
-soup = bs4.BeautifulSoup(res.text, "lxml")
-authors = set([a.text for a in soup.select(".author")])
-quotes = [q.text for q in soup.select(".text")]
+status, body = get_with_cache(session, cache, "http://quotes.toscrape.com/")
+# Only the selected fields are pulled out of the raw bytes, no soup tree
+fields = extract_fields(body)
+authors = set(fields["authors"])
+quotes = fields["quotes"]
 
 print(authors)
 print(quotes)
@@ -14,34 +24,17 @@ print(quotes)
 # print(title[0])
 # print(class_entry_content)
 
-# Loop through different pages until not found -invalid page be reached
-page_still_valid = True
-authors = set()
-page = 1
-url = "http://quotes.toscrape.com/page/"
-
-while page_still_valid:
-
-    # Concatenate to get new page URL
-    page_url = url + str(page)
-
-    # Obtain Request
-    res = requests.get(page_url)
-
-    # Check to see if we're on the last page
-    if "No quotes found!" in res.text:
-        break
-
-    # Turn into Soup
-    soup = bs4.BeautifulSoup(res.text, "lxml")
-
-    # Add Authors to our set
-    for name in soup.select(".author"):
-        authors.add(name.text)
-
-    # Go to Next Page
-    page += 1
+# Crawl every page until the "No quotes found!" one. Progress is checkpointed
+# in .crawl_state, so an interrupted crawl resumes and a re-crawl only
+# extracts again the pages whose content changed
+crawler = Crawler(cache=cache)
+frontier = PageRangeFrontier("http://quotes.toscrape.com/page/")
+with CrawlState(".crawl_state") as state:
+    asyncio.run(crawl_incrementally(crawler, frontier, state, extract_quotes))
+    authors = {record["author"] for record in state.records()}
 
 print("\n")
 print("---------------------------")
 print("unique authors among all the pages: ", authors)
+
+cache.close()
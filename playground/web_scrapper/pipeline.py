@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+
+from crawl_state import CrawlState, ResumableFrontier, is_final
+from crawler import Crawler, Frontier, PageRangeFrontier
+from extraction import extract_quotes
+
+"""
+Fetch/parse pipeline: the crawler's async fetchers feed page bytes through a
+bounded queue to a process pool of parsers, so I/O and CPU overlap and
+parsing uses every core. Backpressure: when the parsers fall behind the
+queue fills, the producer stops pulling from the crawl and no new requests
+start, so at most queue_size + concurrency + parse_workers pages are held
+in memory whatever the size of the crawl.
+
+PipelineMetrics tells which stage limits: fetch_blocked is the time the
+producer waited on a full queue (parse bound, add parse workers), parse_idle
+the time the parsers waited on an empty one (fetch bound, add concurrency).
+
+    python pipeline.py --fixture --pages 200 --latency 0.02 --parse-workers 4
+"""
+
+
+class PipelineMetrics:
+    def __init__(self, parse_workers: int):
+        self.parse_workers = parse_workers
+        self.fetched = 0
+        self.fetched_bytes = 0
+        self.parsed = 0
+        self.skipped = 0
+        self.records = 0
+        self.fetch_blocked = 0.0
+        self.parse_idle = 0.0
+        self.parse_busy = 0.0
+        self.queue_depth_total = 0
+        self.queue_depth_max = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def sample_queue(self, depth: int) -> None:
+        self.queue_depth_total += depth
+        self.queue_depth_max = max(self.queue_depth_max, depth)
+
+    def __str__(self) -> str:
+        elapsed = self.elapsed or time.perf_counter() - self.started
+        parser_time = elapsed * self.parse_workers
+        return "\n".join(
+            [
+                f"fetch: {self.fetched} pages, {self.fetched / elapsed:.1f} pages/s,"
+                f" {self.fetched_bytes / elapsed / 1024:.0f} KiB/s,"
+                f" blocked on a full queue {self.fetch_blocked:.2f}s",
+                f"queue: mean depth"
+                f" {self.queue_depth_total / max(1, self.fetched):.1f},"
+                f" max {self.queue_depth_max}",
+                f"parse: {self.parsed} pages ({self.skipped} unchanged skipped),"
+                f" {self.parsed / elapsed:.1f} pages/s, {self.records} records,"
+                f" parsers busy {100 * self.parse_busy / parser_time:.0f}%,"
+                f" idle {100 * self.parse_idle / parser_time:.0f}%",
+            ]
+        )
+
+
+async def run_pipeline(
+    crawler: Crawler,
+    frontier: Frontier,
+    parse=extract_quotes,
+    on_records=None,
+    parse_workers: int = None,
+    queue_size: int = 64,
+    state: CrawlState = None,
+) -> PipelineMetrics:
+    """
+    Crawls frontier, parsing every wanted page with parse(body) in a process
+    pool; on_records(result, records) receives the output in the event loop.
+    With a CrawlState the crawl is resumable and unchanged pages aren't
+    parsed again.
+    """
+    parse_workers = parse_workers or os.cpu_count()
+    metrics = PipelineMetrics(parse_workers)
+    queue = asyncio.Queue(maxsize=queue_size)
+    loop = asyncio.get_running_loop()
+    if state is not None:
+        frontier = ResumableFrontier(frontier, state)
+
+    async def produce():
+        async with aclosing(crawler.crawl(frontier)) as results:
+            async for result in results:
+                metrics.fetched += 1
+                metrics.fetched_bytes += len(result.body)
+                metrics.sample_queue(queue.qsize())
+                if queue.full():
+                    blocked_at = time.perf_counter()
+                    await queue.put(result)
+                    metrics.fetch_blocked += time.perf_counter() - blocked_at
+                else:
+                    queue.put_nowait(result)
+        for _ in range(parse_workers):
+            await queue.put(None)
+
+    async def consume(executor):
+        while True:
+            waiting_at = time.perf_counter()
+            result = await queue.get()
+            metrics.parse_idle += time.perf_counter() - waiting_at
+            if result is None:
+                return
+            if result.ok:
+                await parse_page(executor, result)
+            elif state is not None and is_final(result):
+                state.mark_done(result.url)
+            if state is not None and state.checkpoint_due():
+                state.checkpoint(frontier.checkpoint())
+
+    async def parse_page(executor, result):
+        if state is not None and not state.content_changed(result):
+            metrics.skipped += 1
+            state.mark_done(result.url)
+            return
+        parsing_at = time.perf_counter()
+        records = await loop.run_in_executor(executor, parse, result.body)
+        metrics.parse_busy += time.perf_counter() - parsing_at
+        metrics.parsed += 1
+        metrics.records += len(records)
+        if state is not None:
+            state.record_page(result, lambda body: records)
+        if on_records is not None:
+            on_records(result, records)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        await asyncio.gather(
+            produce(), *(consume(executor) for _ in range(parse_workers))
+        )
+    if state is not None:
+        state.checkpoint(frontier.checkpoint())
+        if not state.pending_urls():
+            state.checkpoint(frontier.checkpoint(), finished=True)
+    metrics.elapsed = time.perf_counter() - metrics.started
+    return metrics
+
+
+async def main(arguments) -> None:
+    site_runner = None
+    url = arguments.url
+    if arguments.fixture:
+        from fixture_server import DEFAULT_PORT, FixtureSite
+
+        site = FixtureSite(arguments.pages, arguments.latency)
+        site_runner = await site.start(port=DEFAULT_PORT)
+        url = f"http://127.0.0.1:{DEFAULT_PORT}/page/"
+    crawler = Crawler(arguments.concurrency)
+    frontier = PageRangeFrontier(url, window=arguments.concurrency)
+    try:
+        metrics = await run_pipeline(
+            crawler,
+            frontier,
+            parse_workers=arguments.parse_workers,
+            queue_size=arguments.queue_size,
+        )
+    finally:
+        if site_runner is not None:
+            await site_runner.cleanup()
+    print(metrics)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch/parse crawl pipeline")
+    parser.add_argument("url", nargs="?", default="http://quotes.toscrape.com/page/")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--fixture", action="store_true", help="crawl a local site")
+    parser.add_argument("--pages", type=int, default=200, help="fixture pages")
+    parser.add_argument("--latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))